@@ -0,0 +1,62 @@
+import timeit
+
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map
+
+sizes = (1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+buffer_size = 8192
+body = b''
+
+
+def endpoint():
+    return body
+
+
+def start_response(*args):
+    pass
+
+
+def sliced(chunks):
+    for data in chunks:
+        for i in range(0, len(data), buffer_size):
+            yield data[i:i + buffer_size]
+
+
+def write(chunks):
+    length = 0
+
+    for chunk in chunks:
+        length += len(chunk)
+
+    return length
+
+
+def main():
+    global body
+
+    urlmap = Map((Rule('/', 'index'), Endpoint('index', endpoint)))
+    environ = {'PATH_INFO': '/', 'QUERY_STRING': '', 'REQUEST_METHOD': 'GET'}
+
+    single = Main(__name__, urlmap)
+    chunked = Main(__name__, urlmap, chunk_size=buffer_size)
+
+    print(f"{'size':>10} {'sliced':>12} {'single':>12} {'memoryview':>12}  (MB/s)")
+
+    for size in sizes:
+        body, number = b'x' * size, max(10, 2 ** 26 // size)
+
+        results = []
+
+        for call in (
+                lambda: write(sliced(single(environ, start_response))),
+                lambda: write(single(environ, start_response)),
+                lambda: write(chunked(environ, start_response)),
+        ):
+            seconds = min(timeit.repeat(call, number=number, repeat=3))
+            results.append(size * number / seconds / 1024 / 1024)
+
+        print(f"{size:>10} {results[0]:>12.0f} {results[1]:>12.0f} {results[2]:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
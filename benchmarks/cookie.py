@@ -0,0 +1,37 @@
+import time
+import timeit
+from email.utils import formatdate
+
+from framework.http.response.header import cookie_header, http_date
+
+number = 200000
+
+
+def formatted():
+    return formatdate(time.time(), usegmt=True)
+
+
+def session():
+    return cookie_header('session', 'x' * 64, max_age=3600, httponly=True, secure=True, samesite='lax')
+
+
+def plain():
+    return cookie_header('theme', 'dark')
+
+
+def main():
+    print(f"{'case':>24} {'ops/s':>12}")
+
+    for name, call in (
+            ('formatdate', formatted),
+            ('http_date', http_date),
+            ('cookie_header plain', plain),
+            ('cookie_header session', session),
+    ):
+        seconds = min(timeit.repeat(call, number=number, repeat=3))
+
+        print(f"{name:>24} {number / seconds:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
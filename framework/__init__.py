@@ -1 +1,2 @@
 from .main import Main as Framework
+from .asgi import Main as AsyncFramework
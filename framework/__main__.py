@@ -0,0 +1,53 @@
+import argparse
+import os
+
+from .http.response.template import artifact_path, compile_templates
+from .server import load, Server
+
+
+def bind(value: str):
+    host, _, port = value.rpartition(':')
+
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError("Bind must be in 'host:port' form: '%s'." % value)
+
+    return host.strip('[]'), int(port)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m framework')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='run the pre-fork HTTP/1.1 server')
+    serve.add_argument('target', help="application in 'module:attribute' form")
+    serve.add_argument('--bind', type=bind, default=('127.0.0.1', 8000))
+    serve.add_argument('--workers', type=int, default=None)
+    serve.add_argument('--reuse-port', action='store_true')
+    serve.add_argument('--max-requests', type=int, default=0)
+    serve.add_argument('--keep-alive', type=float, default=5)
+    serve.add_argument('--backlog', type=int, default=1024)
+    serve.add_argument('--graceful-timeout', type=float, default=10)
+
+    templates = commands.add_parser('templates', help='precompile templates into an artifact')
+    templates.add_argument('folder', help='template folder')
+    templates.add_argument('--output', default=None, help="artifact path, defaults to '<folder>.compiled'")
+
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case 'serve':
+            host, port = args.bind
+
+            Server(
+                load(args.target), host, port, args.workers, args.reuse_port, args.max_requests, args.keep_alive,
+                args.backlog,
+            ).serve(args.graceful_timeout)
+
+        case 'templates':
+            entries = compile_templates(folder := os.path.abspath(args.folder), args.output)
+
+            print(f"Compiled {len(entries)} templates into {args.output or artifact_path(folder)}")
+
+
+if __name__ == '__main__':
+    main()
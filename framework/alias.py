@@ -1,4 +1,4 @@
-from collections.abc import Callable, Generator, Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from types import TracebackType
 from typing import Any, Protocol, TypeAlias
 
@@ -20,4 +20,9 @@ class StartResponse(Protocol):
 
 WSGIEnvironment: TypeAlias = dict[str, Any]
 WSGIApplication: TypeAlias = Callable[[WSGIEnvironment, StartResponse], Iterable[bytes]]
-WSGIGenerator: TypeAlias = Callable[[StartResponse], Generator[bytes]]
+WSGIGenerator: TypeAlias = Callable[[StartResponse], Iterable[bytes]]
+
+ASGIScope: TypeAlias = dict[str, Any]
+ASGIMessage: TypeAlias = dict[str, Any]
+ASGIReceive: TypeAlias = Callable[[], Awaitable[ASGIMessage]]
+ASGISend: TypeAlias = Callable[[ASGIMessage], Awaitable[None]]
@@ -0,0 +1,197 @@
+import asyncio
+import functools
+import inspect
+import tempfile
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from .alias import ASGIScope, ASGIReceive, ASGISend, WSGIEnvironment, WSGIGenerator
+from .main import Main as WSGIMain
+from .routing.kernel import File
+
+
+def threadsafe(call: Callable[..., Coroutine], loop: asyncio.AbstractEventLoop):
+    def run(*args, **kwargs):
+        return asyncio.run_coroutine_threadsafe(call(*args, **kwargs), loop).result()
+
+    return run
+
+
+async def read_environ(scope: ASGIScope, receive: ASGIReceive, spool_size: int) -> WSGIEnvironment:
+    body, more_body = tempfile.SpooledTemporaryFile(max_size=spool_size), True
+
+    while more_body:
+        message = await receive()
+
+        if 'http.disconnect' == message['type']:
+            break
+
+        if chunk := message.get('body', b''):
+            body.write(chunk)
+
+        more_body = message.get('more_body', False)
+
+    body.seek(0)
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'asgi.scope': scope,
+    }
+
+    if (server := scope.get('server')) is not None:
+        environ['SERVER_NAME'], environ['SERVER_PORT'] = server[0], str(server[1])
+
+    if (client := scope.get('client')) is not None:
+        environ['REMOTE_ADDR'] = client[0]
+
+    for name, value in scope['headers']:
+        name, value = name.decode('latin-1').upper().replace('-', '_'), value.decode('latin-1')
+
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f"HTTP_{name}"
+
+        if name in environ.keys():
+            value = f"{environ[name]}{'; ' if 'HTTP_COOKIE' == name else ','}{value}"
+
+        environ[name] = value
+
+    return environ
+
+
+async def send_response(generator: WSGIGenerator, send: ASGISend, blocking: bool = False):
+    start: list[Any] = list()
+
+    def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None):
+        start.extend((status, headers))
+
+    iterator = iter(generator(start_response))
+
+    async def chunk():
+        if blocking:
+            return await asyncio.to_thread(next, iterator, None)
+
+        return next(iterator, None)
+
+    try:
+        body = await chunk()
+
+        status, headers = start
+
+        await send({
+            'type': 'http.response.start',
+            'status': int(status[:3]),
+            'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+        })
+
+        while body is not None:
+            if body:
+                await send({'type': 'http.response.body', 'body': bytes(body), 'more_body': True})
+
+            body = await chunk()
+
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    finally:
+        if hasattr(iterator, 'close'):
+            iterator.close()
+
+
+class Main(WSGIMain):
+    __slots__ = ()
+
+    spool_size = 1024 * 1024
+
+    async def __call__(self, scope: ASGIScope, receive: ASGIReceive, send: ASGISend):
+        match scope['type']:
+            case 'http':
+                await self.http(scope, receive, send)
+
+            case 'lifespan':
+                await self.lifespan(receive, send)
+
+    async def lifespan(self, receive: ASGIReceive, send: ASGISend):
+        while True:
+            match (await receive())['type']:
+                case 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+
+                case 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+
+                    return
+
+    async def http(self, scope: ASGIScope, receive: ASGIReceive, send: ASGISend):
+        environ = await read_environ(scope, receive, self.spool_size)
+
+        if (filepath := self.static.find(environ['PATH_INFO'])) is not None:
+            await send_response(File(filepath, 'HEAD' == environ['REQUEST_METHOD']), send, True)
+
+        else:
+            if (body := self.screen(environ)) is None:
+                body = await self.route(environ)
+
+            await send_response(body, send, getattr(body, 'size', 0) is None)
+
+    async def route(self, environ: WSGIEnvironment) -> WSGIGenerator:
+        link, kwargs = self.router.request(environ)
+
+        if link is None:
+            return self.router.missing(environ, kwargs)
+
+        if (throttled := self.router.throttle(environ, link)) is not None:
+            return throttled
+
+        if link in self.router.cache and environ['REQUEST_METHOD'] in ('GET', 'HEAD'):
+            return await self.guard(link, kwargs, functools.partial(self.cached, environ, link))
+
+        return await self.guard(link, kwargs, functools.partial(self.invoke, link))
+
+    async def guard(self, link: str, kwargs: dict[str, Any], call: Callable[..., Coroutine]):
+        args = self.router.callback[link][3]
+
+        try:
+            if (chain := self.router.chains.get(link)) is None:
+                return self.router.response(await call(*args, **kwargs))
+
+            call = threadsafe(call, asyncio.get_running_loop())
+
+            return self.router.response(await asyncio.to_thread(chain, call, *args, **kwargs))
+
+        except Exception:
+            return self.router.failure()
+
+    async def cached(self, environ: WSGIEnvironment, link: str, *args, **kwargs):
+        key, cached = self.router.lookup(environ, link)
+
+        if cached is not None:
+            return cached
+
+        return self.router.store(link, key, self.router.response(await self.invoke(link, *args, **kwargs)))
+
+    async def invoke(self, link: str, *args, **kwargs):
+        if link in self.router.executor.keys():
+            executor, future = self.router.offload(link, args, kwargs)
+
+            if future is None:
+                return self.router.unavailable(executor.retry_after)
+
+            try:
+                return self.router.result(link, await asyncio.wait_for(asyncio.wrap_future(future), executor.timeout))
+
+            except TimeoutError:
+                executor.count('timeouts')
+
+                return self.router.unavailable(executor.retry_after)
+
+        call = self.router.endpoint(link)[0]
+
+        if inspect.iscoroutinefunction(call):
+            return await call(*args, **kwargs)
+
+        return await asyncio.to_thread(call, *args, **kwargs)
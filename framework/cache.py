@@ -0,0 +1,186 @@
+import hashlib
+import marshal
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .alias import HeadersAlias, WSGIEnvironment
+
+EntryAlias = tuple[str, HeadersAlias, bytes]
+
+
+class Backend(object):
+    __slots__ = ()
+
+    def get(self, key: str) -> EntryAlias | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: EntryAlias, ttl: int | float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class Memory(Backend):
+    __slots__ = ('entries', 'size', 'bytes', 'store', 'lock')
+
+    def __init__(self, entries: int = 1024, size: int = 16 * 1024 * 1024):
+        self.entries, self.size, self.bytes = entries, size, 0
+        self.store: OrderedDict[str, tuple[float, EntryAlias]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            if (item := self.store.get(key)) is None:
+                return None
+
+            if item[0] < time.monotonic():
+                self.pop(key)
+
+                return None
+
+            self.store.move_to_end(key)
+
+            return item[1]
+
+    def set(self, key: str, entry: EntryAlias, ttl: int | float):
+        if (length := len(entry[2])) > self.size:
+            return
+
+        with self.lock:
+            if key in self.store:
+                self.pop(key)
+
+            self.store[key], self.bytes = (time.monotonic() + ttl, entry), self.bytes + length
+
+            while len(self.store) > self.entries or self.bytes > self.size:
+                self.pop(next(iter(self.store)))
+
+    def delete(self, key: str):
+        with self.lock:
+            if key in self.store:
+                self.pop(key)
+
+    def clear(self):
+        with self.lock:
+            self.store.clear()
+            self.bytes = 0
+
+    def pop(self, key: str):
+        self.bytes -= len(self.store.pop(key)[1][2])
+
+
+class Filesystem(Backend):
+    __slots__ = ('folder',)
+
+    def __init__(self, folder: str | os.PathLike):
+        self.folder = os.path.abspath(folder)
+
+        os.makedirs(self.folder, exist_ok=True)
+
+    def filepath(self, key: str):
+        return os.path.join(self.folder, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str):
+        try:
+            with open(filepath := self.filepath(key), 'rb') as f:
+                expires, stored, entry = marshal.load(f)
+
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if stored != key:
+            return None
+
+        if expires < time.time():
+            self.remove(filepath)
+
+            return None
+
+        status, headers, body = entry
+
+        return status, [(k, v) for k, v in headers], body
+
+    def set(self, key: str, entry: EntryAlias, ttl: int | float):
+        filepath = self.filepath(key)
+        temp = f"{filepath}.{os.getpid()}.{threading.get_ident()}"
+
+        try:
+            with open(temp, 'wb') as f:
+                marshal.dump((time.time() + ttl, key, entry), f)
+
+            os.replace(temp, filepath)
+
+        except OSError:
+            self.remove(temp)
+
+    def delete(self, key: str):
+        self.remove(self.filepath(key))
+
+    def clear(self):
+        for name in os.listdir(self.folder):
+            self.remove(os.path.join(self.folder, name))
+
+    @staticmethod
+    def remove(filepath: str):
+        try:
+            os.remove(filepath)
+
+        except OSError:
+            pass
+
+
+class Cache(object):
+    __slots__ = ('ttl', 'query', 'cookie', 'header', 'backend')
+
+    def __init__(
+            self,
+            ttl: int | float,
+            query: tuple[str, ...] = None,
+            cookie: tuple[str, ...] = (),
+            header: tuple[str, ...] = (),
+            entries: int = 1024,
+            size: int = 16 * 1024 * 1024,
+            backend: Backend = None,
+    ):
+        if 0 >= ttl:
+            raise ValueError('Response cache. TTL must be a positive number: %s.' % ttl)
+
+        for attr, value in (
+                ('ttl', ttl),
+                ('query', query),
+                ('cookie', cookie),
+                ('header', tuple(f"HTTP_{h.upper().replace('-', '_')}" for h in header)),
+                ('backend', Memory(entries, size) if backend is None else backend),
+        ):
+            setattr(self, attr, value)
+
+    def key(
+            self, link: str, environ: WSGIEnvironment, query: dict[str, str], cookie: dict[str, str], host: bool = False
+    ):
+        parts = [link, environ['PATH_INFO']]
+
+        if host:
+            parts.append(environ.get('HTTP_HOST', '').lower())
+
+        if self.query is None:
+            parts.append(environ['QUERY_STRING'])
+
+        else:
+            parts.extend(f"{k}={query.get(k, '')}" for k in self.query)
+
+        parts.extend(f"{k}={cookie.get(k, '')}" for k in self.cookie)
+        parts.extend(f"{k}={environ.get(k, '')}" for k in self.header)
+
+        return '\n'.join(parts)
+
+    def get(self, key: str):
+        return self.backend.get(key)
+
+    def set(self, key: str, entry: EntryAlias):
+        self.backend.set(key, entry, self.ttl)
@@ -0,0 +1,213 @@
+import contextvars
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+
+class Pool(object):
+    __slots__ = ('workers', 'queue', 'timeout', 'retry_after', 'executor', 'lock', 'counters')
+
+    def __init__(self, workers: int = 8, queue: int = 32, timeout: int | float = 30, retry_after: int = 1):
+        if 1 > workers or 0 > queue:
+            raise ValueError('Thread pool. Workers must be positive and queue must not be negative.')
+
+        self.workers, self.queue, self.timeout, self.retry_after = workers, queue, timeout, retry_after
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ('submitted', 'pending', 'active', 'completed', 'failed', 'rejected', 'timeouts'), 0
+        )
+
+    def submit(self, call: Callable[..., Any], *args, **kwargs) -> Future | None:
+        with self.lock:
+            if self.counters['pending'] >= self.workers + self.queue:
+                self.counters['rejected'] += 1
+
+                return None
+
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, 'framework-pool')
+
+            self.counters['submitted'] += 1
+            self.counters['pending'] += 1
+
+        future = self.executor.submit(self.run, contextvars.copy_context(), call, args, kwargs)
+        future.add_done_callback(self.done)
+
+        return future
+
+    def run(self, context: contextvars.Context, call: Callable[..., Any], args: tuple, kwargs: dict[str, Any]):
+        self.count('active', 1)
+
+        try:
+            return context.run(call, *args, **kwargs)
+
+        finally:
+            self.count('active', -1)
+
+    def done(self, future: Future):
+        with self.lock:
+            self.counters['pending'] -= 1
+            self.counters['failed' if future.cancelled() or future.exception() is not None else 'completed'] += 1
+
+    def count(self, name: str, value: int = 1):
+        with self.lock:
+            self.counters[name] += value
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+
+        stats['queued'] = stats['pending'] - stats['active']
+
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        if self.executor is not None:
+            self.executor.shutdown(wait)
+
+            self.executor = None
+
+    def fork(self):
+        self.executor, self.lock = None, threading.Lock()
+        self.counters = dict.fromkeys(self.counters.keys(), 0)
+
+
+def setup(templates: str, static: str, link: dict[str, Any], sessions: Any = None):
+    from .http import response, session
+    from .http.response.template import Template
+
+    for attr, value in (('_static', static), ('_link', link)):
+        setattr(response, attr, value)
+
+    setattr(Template, 'templates', templates)
+    setattr(session, '_sessions', sessions)
+
+
+def warm(delay: float):
+    time.sleep(delay)
+
+    return os.getpid()
+
+
+def execute(callback: tuple[str, str, str | None, tuple[Any, ...]], kwargs: dict[str, Any], state: tuple):
+    from .http import request, response, session, Form
+    from .http.response.header import Header
+    from .routing.kernel import import_call, as_tuple
+
+    environ, query, cookie, data, files, current = state
+
+    form = Form(dict())
+    form.data, form.files = data, files
+
+    for attr, value in (('_env', environ), ('_query', query), ('_cookie', cookie), ('_form', form)):
+        getattr(request, attr).set(value)
+
+    getattr(response, '_header').set(header := Header())
+    getattr(session, '_session').set(current)
+
+    module, name, method, args = callback
+
+    result = as_tuple(import_call(module, name, method)(*args, **kwargs))
+
+    if current is not None:
+        current.save()
+
+    return result, header.simple, header.cookie, None if current is None else current.data
+
+
+class Processes(object):
+    __slots__ = ('workers', 'timeout', 'retry_after', 'executor', 'initargs', 'limits', 'lock', 'counters')
+
+    def __init__(self, workers: int = None, timeout: int | float = 30, retry_after: int = 1):
+        if workers is not None and 1 > workers:
+            raise ValueError('Process pool. Workers must be positive.')
+
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.timeout, self.retry_after = timeout, retry_after
+        self.executor: ProcessPoolExecutor | None = None
+        self.initargs: tuple[str, str, dict[str, Any], Any] | None = None
+        self.limits: dict[str, threading.BoundedSemaphore] = dict()
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ('submitted', 'pending', 'completed', 'failed', 'rejected', 'timeouts'), 0
+        )
+
+    def start(self, templates: str, static: str, link: dict[str, Any], sessions: Any = None):
+        if self.initargs is None:
+            self.initargs = templates, static, link, sessions
+
+        self.spawn()
+
+    def spawn(self):
+        with self.lock:
+            if self.executor is None:
+                executor = ProcessPoolExecutor(self.workers, initializer=setup, initargs=self.initargs)
+
+                for future in [executor.submit(warm, 0.05) for _ in range(self.workers)]:
+                    future.result()
+
+                self.executor = executor
+
+        return self.executor
+
+    def submit(
+            self,
+            link: str,
+            concurrency: int | None,
+            callback: tuple[str, str, str | None, tuple[Any, ...]],
+            kwargs: dict[str, Any],
+            state: tuple,
+    ) -> Future | None:
+        if concurrency is not None:
+            if link not in self.limits.keys():
+                with self.lock:
+                    self.limits.setdefault(link, threading.BoundedSemaphore(concurrency))
+
+            if not (limit := self.limits[link]).acquire(False):
+                self.count('rejected')
+
+                return None
+
+        else:
+            limit = None
+
+        self.count('submitted')
+        self.count('pending')
+
+        future = (self.executor or self.spawn()).submit(execute, callback, kwargs, state)
+        future.add_done_callback(lambda f: self.done(f, limit))
+
+        return future
+
+    def done(self, future: Future, limit: threading.BoundedSemaphore | None):
+        if limit is not None:
+            limit.release()
+
+        with self.lock:
+            self.counters['pending'] -= 1
+            self.counters['failed' if future.cancelled() or future.exception() is not None else 'completed'] += 1
+
+    def count(self, name: str, value: int = 1):
+        with self.lock:
+            self.counters[name] += value
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def shutdown(self, wait: bool = True):
+        if self.executor is not None:
+            self.executor.shutdown(wait)
+
+            self.executor = None
+
+    def fork(self):
+        self.executor, self.lock, self.limits = None, threading.Lock(), dict()
+        self.counters = dict.fromkeys(self.counters.keys(), 0)
+
+        if self.initargs is not None:
+            self.spawn()
@@ -1,30 +1,32 @@
+from contextvars import ContextVar
+
 from . import Query, Cookie, Form
 from ..alias import WSGIEnvironment
 
-_env: WSGIEnvironment
-_query: Query
-_cookie: Cookie
-_form: Form
+_env: ContextVar[WSGIEnvironment] = ContextVar('env')
+_query: ContextVar[Query] = ContextVar('query')
+_cookie: ContextVar[Cookie] = ContextVar('cookie')
+_form: ContextVar[Form] = ContextVar('form')
 
 
 def env(name: str):
-    return _env.get(name)
+    return _env.get().get(name)
 
 
 def query(name: str):
-    return _query.get(name)
+    return _query.get().get(name)
 
 
 def cookie(name: str):
-    return _cookie.get(name)
+    return _cookie.get().get(name)
 
 
 def form(name: str):
-    return _form.data.get(name)
+    return _form.get().data.get(name)
 
 
 def upload(name: str):
-    return _form.files.get(name)
+    return _form.get().files.get(name)
 
 
 class Path(object):
@@ -1,14 +1,18 @@
 import os
+from collections.abc import Iterable
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Literal
+from typing import Any, Literal
 
-from .header import Cookie, Header
-from .template import Template
+from .event import Event, EventStream
+from .header import cookie_header, format_datetime, http_date, not_modified, Header
+from .template import Markup, Template
+from .. import request
 from ...routing.map import Link
 
 _static: str
 _link: Link
-_header: Header
+_header: ContextVar[Header] = ContextVar('header')
 
 
 def url_file(name: str):
@@ -20,20 +24,20 @@ def url_for(*args: str, **kwargs: str):
 
 
 def set_header(name: str, value: str):
-    _header.simple[name.lower()] = value
+    _header.get().simple[name.lower()] = value
 
 
 def get_header(name: str):
-    return _header.simple.get(name.lower())
+    return _header.get().simple.get(name.lower())
 
 
 def has_header(name: str):
-    return name.lower() in _header.simple.keys()
+    return name.lower() in _header.get().simple.keys()
 
 
 def delete_header(name: str):
-    if (name := name.lower()) in _header.simple.keys():
-        del _header.simple[name]
+    if (name := name.lower()) in (simple := _header.get().simple).keys():
+        del simple[name]
 
 
 def set_cookie(
@@ -47,47 +51,56 @@ def set_cookie(
         httponly: bool = False,
         samesite: Literal['none', 'lax', 'strict'] = None,
 ):
-    cookie = Cookie(name, value)
+    _header.get().cookie[name] = cookie_header(
+        name, value, expires, max_age, path, domain, secure, httponly, samesite
+    )
 
-    if expires is not None:
-        cookie['expires'] = expires
 
-    if max_age is not None:
-        cookie['max-age'] = max_age
+def delete_cookie(name: str, path: str = '/', domain: str = None):
+    _header.get().cookie[name] = cookie_header(name, '', 0, None, path, domain)
 
-    cookie['path'] = path
 
-    if domain is not None:
-        cookie['domain'] = domain
+def fresh(etag: str = None, last_modified: datetime | int | float = None, weak: bool = True):
+    if etag is not None:
+        _header.get().simple['etag'] = etag = f'W/"{etag}"' if weak else f'"{etag}"'
 
-    if secure:
-        cookie['secure'] = 'Secure'
+    if last_modified is not None:
+        if isinstance(last_modified, int | float):
+            last_modified = http_date(last_modified)
 
-    if httponly:
-        cookie['httponly'] = 'HttpOnly'
+        else:
+            last_modified = format_datetime(last_modified)
 
-    if samesite is not None:
-        cookie['samesite'] = samesite
+        _header.get().simple['last-modified'] = last_modified
 
-    _header.cookie[name] = cookie.value
+    return not_modified(getattr(request, '_env').get(), etag, last_modified)
 
 
-def delete_cookie(name: str, path: str = '/', domain: str = None):
-    cookie = Cookie(name, '')
+def not_modified_page():
+    return b'', 304
 
-    cookie['expires'] = 0
 
-    cookie['path'] = path
+def redirect_page(urlpath: str, status_code: int = 307):
+    return b'', status_code, [('location', urlpath)]
 
-    if domain is not None:
-        cookie['domain'] = domain
 
-    _header.cookie[name] = cookie.value
+def json_page(data: dict | list | Iterable, status_code: int = None):
+    return data, status_code, None, 'application/json'
 
 
-def redirect_page(urlpath: str, status_code: int = 307):
-    return b'', status_code, [('location', urlpath)]
+def event_stream(events: Iterable[Event | Any], heartbeat: int | float = 15, status_code: int = None):
+    return (
+        EventStream(events, heartbeat),
+        status_code,
+        [('cache-control', 'no-cache'), ('x-accel-buffering', 'no')],
+        'text/event-stream',
+        'utf-8',
+    )
 
 
-def render_template(filename: str | os.PathLike, context: dict[str, str] = None, status_code: int = None):
+def render_template(filename: str | os.PathLike, context: dict[str, Any] = None, status_code: int = None):
     return Template(filename).render(context), status_code, None, 'text/html'
+
+
+def stream_template(filename: str | os.PathLike, context: dict[str, Any] = None, status_code: int = None):
+    return Template(filename).stream(context), status_code, None, 'text/html'
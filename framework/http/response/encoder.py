@@ -0,0 +1,76 @@
+import json
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+DumpsAlias = Callable[[Any], bytes]
+
+
+def orjson_dumps() -> DumpsAlias:
+    import orjson
+
+    return orjson.dumps
+
+
+def ujson_dumps() -> DumpsAlias:
+    import ujson
+
+    def dumps(obj: Any):
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+
+    return dumps
+
+
+def json_dumps() -> DumpsAlias:
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def dumps(obj: Any):
+        return encode(obj).encode('utf-8')
+
+    return dumps
+
+
+backends = {
+    'orjson': orjson_dumps,
+    'ujson': ujson_dumps,
+    'json': json_dumps,
+}
+
+
+def encoder(backend: str | DumpsAlias = None) -> DumpsAlias:
+    if callable(backend):
+        return backend
+
+    if backend is not None:
+        if backend not in backends.keys():
+            raise ValueError("JSON encoder. Unknown backend: '%s'." % backend)
+
+        return backends[backend]()
+
+    for dumps in backends.values():
+        try:
+            return dumps()
+
+        except ImportError:
+            continue
+
+
+def iterencode(dumps: DumpsAlias, items: Iterable[Any], buffer_size: int) -> Generator[bytes]:
+    buffer, first = bytearray(b'['), True
+
+    for item in items:
+        if first:
+            first = False
+
+        else:
+            buffer += b','
+
+        buffer += dumps(item)
+
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+
+            buffer.clear()
+
+    buffer += b']'
+
+    yield bytes(buffer)
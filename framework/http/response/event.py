@@ -0,0 +1,123 @@
+import contextvars
+import queue
+import threading
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+end = object()
+
+
+class Event(object):
+    __slots__ = ('data', 'event', 'id', 'retry')
+
+    def __init__(self, data: Any = None, event: str = None, id: str = None, retry: int = None):
+        for name, value in (('event', event), ('id', id)):
+            if value is not None and ('\r' in (value := str(value)) or '\n' in value or '\0' in value):
+                raise ValueError("Event. Field must not contain line breaks or NUL: '%s'." % name)
+
+        self.data, self.event, self.id, self.retry = data, event, id, retry
+
+    def encode(self, dumps: Callable[[Any], bytes]):
+        lines = list()
+
+        if self.event is not None:
+            lines.append(f"event: {self.event}")
+
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+
+        if self.retry is not None:
+            lines.append(f"retry: {int(self.retry)}")
+
+        if (data := self.data) is not None:
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+
+            elif not isinstance(data, str):
+                data = dumps(data).decode('utf-8')
+
+            lines.extend(f"data: {line}" for line in data.splitlines() or ('',))
+
+        return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class EventStream(object):
+    __slots__ = ('events', 'heartbeat')
+
+    def __init__(self, events: Iterable[Any], heartbeat: int | float = None):
+        self.events, self.heartbeat = events, heartbeat
+
+    def __call__(self, dumps: Callable[[Any], bytes]) -> Generator[bytes]:
+        if self.heartbeat is None:
+            return self.direct(dumps)
+
+        return self.pumped(dumps)
+
+    def direct(self, dumps: Callable[[Any], bytes]) -> Generator[bytes]:
+        try:
+            for event in self.events:
+                yield (event if isinstance(event, Event) else Event(event)).encode(dumps)
+
+        finally:
+            if hasattr(self.events, 'close'):
+                self.events.close()
+
+    def pumped(self, dumps: Callable[[Any], bytes]) -> Generator[bytes]:
+        events, stopped, source = queue.Queue(32), threading.Event(), self.direct(dumps)
+
+        def put(item: Any):
+            while not stopped.is_set():
+                try:
+                    events.put(item, timeout=1)
+
+                    return
+
+                except queue.Full:
+                    continue
+
+        def produce():
+            try:
+                for event in source:
+                    if stopped.is_set():
+                        break
+
+                    put(event)
+
+            except ValueError:
+                if not stopped.is_set():
+                    raise
+
+            finally:
+                close()
+                put(end)
+
+        def close():
+            try:
+                source.close()
+
+            except ValueError:
+                pass
+
+        threading.Thread(
+            target=contextvars.copy_context().run, args=(produce,), name='framework-events', daemon=True
+        ).start()
+
+        try:
+            while True:
+                try:
+                    item = events.get(timeout=self.heartbeat)
+
+                except queue.Empty:
+                    yield b':\n\n'
+
+                    continue
+
+                if item is end:
+                    break
+
+                yield item
+
+        finally:
+            stopped.set()
+
+            close()
@@ -1,109 +1,157 @@
+import hashlib
+import math
 import re
 import time
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+from ...alias import HeadersAlias, WSGIEnvironment
 
 wd = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 mn = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
+date_pattern = re.compile(r'^([A-Za-z]{3}), (\d{2}) ([A-Za-z]{3}) (\d{4}) (\d{2}:\d{2}:\d{2}) GMT$')
+dates: dict[int, str] = dict()
+fragments: dict[tuple[str | None, str | None, bool, bool, str | None], str] = dict()
+
+
+def http_date(timestamp: int | float = None):
+    second = math.floor(time.time() if timestamp is None else timestamp)
+
+    if (value := dates.get(second)) is None:
+        if 256 <= len(dates):
+            dates.clear()
+
+        t = time.gmtime(second)
+
+        value = dates[second] = '%s, %02d %s %04d %02d:%02d:%02d GMT' % (
+            wd[t[6]], t[2], mn[t[1] - 1], t[0], t[3], t[4], t[5]
+        )
+
+    return value
+
 
 def format_datetime(dt: datetime):
     if dt.tzinfo is None or dt.tzinfo != timezone.utc:
         raise ValueError('Cookie requires UTC datetime.')
 
-    t = dt.timetuple()
+    return http_date(dt.timestamp())
+
+
+def weak_etag(body: bytes):
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def validators(headers: HeadersAlias):
+    etag, last_modified = None, None
+
+    for key, value in headers:
+        match key:
+            case 'etag':
+                etag = value
+
+            case 'last-modified':
+                last_modified = value
+
+    return etag, last_modified
+
+
+def not_modified(environ: WSGIEnvironment, etag: str | None, last_modified: str | None):
+    if environ.get('REQUEST_METHOD', 'GET') not in ('GET', 'HEAD'):
+        return False
 
-    return '%s, %02d %s %04d %02d:%02d:%02d GMT' % (wd[t[6]], t[2], mn[t[1] - 1], t[0], t[3], t[4], t[5])
+    if (match := environ.get('HTTP_IF_NONE_MATCH')) is not None:
+        if etag is None:
+            return False
 
+        if '*' == (match := match.strip()):
+            return True
 
-class Morsel(object):
-    __slots__ = ('value', 'expires', 'max_age', 'path', 'domain', 'secure', 'httponly', 'samesite')
+        return etag.removeprefix('W/') in (i.strip().removeprefix('W/') for i in match.split(','))
 
-    def __init__(self, name: str, value: str):
-        self.value = f"{name}={value}"
+    if last_modified is not None and (since := environ.get('HTTP_IF_MODIFIED_SINCE')) is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(since)
 
+        except (TypeError, ValueError):
+            pass
 
-class Cookie(object):
-    __slots__ = ('name', 'morsel')
+    return False
 
-    def __init__(self, name: str, value: str):
-        self.name, self.morsel = name, Morsel(name, value)
 
-    def __setitem__(self, key: str, value: datetime | timedelta | str | int | float | bool):
-        if key in ('domain', 'secure', 'httponly'):
-            setattr(self.morsel, key, value)
+def cookie_expires(value: datetime | str | int | float):
+    if isinstance(value, int | float):
+        return http_date(value)
 
-        else:
-            match key:
-                case 'expires':
-                    self.expires(value)
+    if isinstance(value, datetime):
+        return format_datetime(value)
 
-                case 'max-age':
-                    self.max_age(value)
+    if (r := date_pattern.match(value)) is None or r[1] not in wd or r[3] not in mn:
+        raise ValueError('Datetime string format does not match for cookie.')
 
-                case 'path':
-                    if '' == value:
-                        raise ValueError('The path value of a cookie cannot be the empty string.')
+    return value
 
-                    self.morsel.path = value
 
-                case 'samesite':
-                    if value not in ('none', 'lax', 'strict'):
-                        raise ValueError(f"The samesite='{value}' cookie value must be 'none', 'lax' or 'strict'.")
+def cookie_fragment(path: str | None, domain: str | None, secure: bool, httponly: bool, samesite: str | None):
+    if (fragment := fragments.get(key := (path, domain, secure, httponly, samesite))) is None:
+        if 256 <= len(fragments):
+            fragments.clear()
 
-                    self.morsel.samesite = value.title()
+        parts = list()
 
-    def expires(self, value: datetime | str | int | float):
-        if isinstance(value, int | float):
-            value = datetime.fromtimestamp(value, tz=timezone.utc)
+        if path is not None:
+            if '' == path:
+                raise ValueError('The path value of a cookie cannot be the empty string.')
 
-        if isinstance(value, datetime):
-            self.morsel.expires = format_datetime(value)
+            parts.append(f"; Path={path}")
 
-        else:
-            if r := re.search(
-                    r'^([A-Za-z]{3}), (\d{2}) ([A-Za-z]{3}) (\d{4}) (\d{2}:\d{2}:\d{2}) GMT$', value
-            ):
-                if r[1] in wd and r[3] in mn:
-                    self.morsel.expires = value
+        if domain is not None:
+            parts.append(f"; Domain={domain}")
 
-            if not hasattr(self.morsel, 'expires'):
-                raise ValueError('Datetime string format does not match for cookie.')
+        if secure:
+            parts.append('; Secure')
 
-    def max_age(self, value: timedelta | int):
-        if isinstance(value, timedelta):
-            value = int(value.total_seconds())
+        if httponly:
+            parts.append('; HttpOnly')
 
-        if not hasattr(self.morsel, 'expires'):
-            self.expires(datetime.fromtimestamp(time.time() + value, timezone.utc))
+        if samesite is not None:
+            if samesite not in ('none', 'lax', 'strict'):
+                raise ValueError(f"The samesite='{samesite}' cookie value must be 'none', 'lax' or 'strict'.")
 
-        self.morsel.max_age = str(value)
+            parts.append(f"; SameSite={samesite.title()}")
 
-    @property
-    def value(self):
-        value = (morsel := self.morsel).value
+        fragment = fragments.setdefault(key, ''.join(parts))
 
-        if hasattr(morsel, 'expires'):
-            value = f"{value}; expires={morsel.expires}"
+    return fragment
 
-        if hasattr(morsel, 'max_age'):
-            value = f"{value}; Max-Age={morsel.max_age}"
 
-        if hasattr(morsel, 'path'):
-            value = f"{value}; Path={morsel.path}"
+def cookie_header(
+        name: str,
+        value: str,
+        expires: datetime | str | int | float = None,
+        max_age: timedelta | int = None,
+        path: str = '/',
+        domain: str = None,
+        secure: bool = False,
+        httponly: bool = False,
+        samesite: str = None,
+):
+    header = f"{name}={value}"
 
-        if hasattr(morsel, 'domain'):
-            value = f"{value}; Domain={morsel.domain}"
+    if max_age is not None:
+        if isinstance(max_age, timedelta):
+            max_age = int(max_age.total_seconds())
 
-        if hasattr(morsel, 'secure'):
-            value = f"{value}; {morsel.secure}"
+        if expires is None:
+            expires = time.time() + max_age
 
-        if hasattr(morsel, 'httponly'):
-            value = f"{value}; {morsel.httponly}"
+    if expires is not None:
+        header = f"{header}; expires={cookie_expires(expires)}"
 
-        if hasattr(morsel, 'samesite'):
-            value = f"{value}; SameSite={morsel.samesite}"
+    if max_age is not None:
+        header = f"{header}; Max-Age={max_age}"
 
-        return value
+    return f"{header}{cookie_fragment(path, domain, secure, httponly, samesite)}"
 
 
 class Header(object):
@@ -114,7 +162,7 @@ class Header(object):
         self.cookie: dict[str, str] = dict()
 
     def headers(self):
-        return [(k, v) for k, v in self.simple.items()]
+        return self.simple.items()
 
     def cookies(self):
-        return [('set-cookie', v) for v in self.cookie.values()]
+        return (('set-cookie', v) for v in self.cookie.values())
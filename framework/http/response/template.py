@@ -1,5 +1,31 @@
+import hashlib
+import html
+import marshal
 import os
+import posixpath
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Generator, Iterable
+from typing import Any
+
+token_pattern = re.compile(
+    r'{%(-?) (for|if|elif|else|endfor|endif|cache|endcache)\b ?([^%]*?) ?(-?)%}'
+    r'|{{ ([A-Za-z0-9_]+\(?[\sA-Za-z0-9_,=\'."]*\)?) }}'
+)
+for_pattern = re.compile(r'([A-Za-z_][A-Za-z0-9_]*) in ([A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)*)')
+cache_pattern = re.compile(
+    r'([A-Za-z0-9_]+)((?: [A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)*)*?)(?: ttl=([0-9]+(?:\.[0-9]+)?))?'
+)
+path_pattern = re.compile(r'[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)*')
+call_pattern = re.compile(r'([A-Za-z0-9_]+)\(\s*([A-Za-z0-9 _,=\'."]+[\'"])')
+
+PartsAlias = tuple[str | tuple[str, ...], ...]
+ProgramAlias = PartsAlias
+DependencyAlias = tuple[str, int, int, str]
+
+artifact_version = 4
 
 
 class Http(object):
@@ -35,31 +61,297 @@ class Http(object):
         return '' if value is None else value
 
 
-def context_replace(context: dict[str, str] | None, body: str):
-    keys, http = tuple() if context is None else context.keys(), Http()
+class Markup(str):
+    __slots__ = ()
 
-    for key in re.findall(r'{{ ([A-Za-z0-9_]+\(?[\sA-Za-z0-9_,=\'."]*\)?) }}', body):
-        if key in keys:
-            body = body.replace('{{ %s }}' % key, context[key])
+    def __html__(self):
+        return self
 
-        elif '(' in key:
-            if r := re.findall(r'([A-Za-z0-9_]+)\(\s*([A-Za-z0-9 _,=\'."]+[\'"])', key):
-                name, args = r[-1]
 
-                if name not in http.__slots__ and hasattr(http, name):
-                    body = body.replace('{{ %s }}' % key, getattr(http, name)(args))
+escapes: dict[str, Markup] = dict()
 
-    return body.rstrip()
+
+def escape(value: Any):
+    if isinstance(value, Markup):
+        return value
+
+    if hasattr(value, '__html__'):
+        return Markup(value.__html__())
+
+    return Markup(html.escape(str(value)))
+
+
+def escape_cached(value: str):
+    if (escaped := escapes.get(value)) is None:
+        if 1024 <= len(escapes):
+            escapes.clear()
+
+        escaped = escapes[value] = escape(value)
+
+    return escaped
+
+
+def template_error(message: str, *args: Any):
+    raise ValueError(f"Template. {message}" % args)
+
+
+def condition(argument: str):
+    if not path_pattern.fullmatch(path := argument[4:] if (negate := argument.startswith('not ')) else argument):
+        template_error("Invalid condition: '%s'.", argument)
+
+    return negate, tuple(path.split('.'))
+
+
+def variable(key: str, raw: str):
+    if '(' in key:
+        if r := call_pattern.findall(key):
+            return 'call', *r[-1], raw
+
+        return raw
+
+    return 'var', tuple(key.strip().split('.')), raw
+
+
+def compile_parts(body: str) -> PartsAlias:
+    parts: list[list[Any]] = [list()]
+    stack: list[list[Any]] = list()
+    position, trim = 0, False
+
+    for match in token_pattern.finditer(body):
+        left, tag, argument, right, key = match.groups()
+
+        text = body[position:match.start()]
+
+        if trim:
+            text = text.lstrip()
+
+        if '-' == left:
+            text = text.rstrip()
+
+        if text:
+            parts[-1].append(text)
+
+        position, trim = match.end(), '-' == right
+
+        if key is not None:
+            parts[-1].append(variable(key, match.group()))
+
+            continue
+
+        match tag:
+            case 'for':
+                if (r := for_pattern.fullmatch(argument)) is None:
+                    template_error("Invalid loop: '%s'.", argument)
+
+                stack.append(['for', r[1], tuple(r[2].split('.')), None])
+                parts.append(list())
+
+            case 'if':
+                stack.append(['if', list(), condition(argument)])
+                parts.append(list())
+
+            case 'elif':
+                if not stack or 'if' != stack[-1][0] or stack[-1][2] is None:
+                    template_error('Unexpected {%% elif %%}.')
+
+                stack[-1][1].append((*stack[-1][2], tuple(parts.pop())))
+                stack[-1][2] = condition(argument)
+                parts.append(list())
+
+            case 'else':
+                if not stack or 'cache' == stack[-1][0] or (stack[-1][2] is None if 'if' == stack[-1][0] else stack[-1][3] is not None):
+                    template_error('Unexpected {%% else %%}.')
+
+                if 'if' == stack[-1][0]:
+                    stack[-1][1].append((*stack[-1][2], tuple(parts.pop())))
+                    stack[-1][2] = None
+
+                else:
+                    stack[-1][3] = tuple(parts.pop())
+
+                parts.append(list())
+
+            case 'endif':
+                if not stack or 'if' != stack[-1][0]:
+                    template_error('Unexpected {%% endif %%}.')
+
+                _, branches, pending = stack.pop()
+
+                if pending is None:
+                    otherwise = tuple(parts.pop())
+
+                else:
+                    branches.append((*pending, tuple(parts.pop())))
+                    otherwise = ()
+
+                parts[-1].append(('if', tuple(branches), otherwise))
+
+            case 'endfor':
+                if not stack or 'for' != stack[-1][0]:
+                    template_error('Unexpected {%% endfor %%}.')
+
+                _, name, path, loop = stack.pop()
+
+                if loop is None:
+                    loop, otherwise = tuple(parts.pop()), ()
+
+                else:
+                    otherwise = tuple(parts.pop())
+
+                parts[-1].append(('for', name, path, loop, otherwise))
+
+            case 'cache':
+                if (r := cache_pattern.fullmatch(argument)) is None:
+                    template_error("Invalid cache: '%s'.", argument)
+
+                keys, ttl = tuple(tuple(k.split('.')) for k in r[2].split()), None if r[3] is None else float(r[3])
+
+                stack.append(['cache', r[1], keys, ttl])
+                parts.append(list())
+
+            case 'endcache':
+                if not stack or 'cache' != stack[-1][0]:
+                    template_error('Unexpected {%% endcache %%}.')
+
+                (_, name, keys, ttl), inner = stack.pop(), tuple(parts.pop())
+
+                parts[-1].append(('cache', name, keys, ttl, inner))
+
+    if stack:
+        template_error('Unclosed {%% %s %%}.', stack[-1][0])
+
+    if text := body[position:].lstrip() if trim else body[position:]:
+        parts[-1].append(text)
+
+    return tuple(parts[-1])
+
+
+def lookup(scope: dict[str, Any], path: tuple[str, ...]):
+    value = scope[path[0]]
+
+    for name in path[1:]:
+        if value is None:
+            break
+
+        value = value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+    return value
+
+
+def iter_parts(scope: dict[str, Any], parts: PartsAlias, http: Http, fragments: 'Fragments') -> Generator[str]:
+    for part in parts:
+        if isinstance(part, str):
+            yield part
+
+            continue
+
+        match part[0]:
+            case 'var':
+                if part[1][0] in scope.keys():
+                    if (value := lookup(scope, part[1])) is not None:
+                        yield escape(value)
+
+                else:
+                    yield part[2]
+
+            case 'call':
+                if part[1] not in http.__slots__ and hasattr(http, part[1]):
+                    if 'form' == part[1]:
+                        yield escape(http.form(part[2]))
+
+                    else:
+                        yield escape_cached(getattr(http, part[1])(part[2]))
+
+                else:
+                    yield part[3]
+
+            case 'if':
+                for negate, path, branch in part[1]:
+                    if negate is not bool(path[0] in scope.keys() and lookup(scope, path)):
+                        yield from iter_parts(scope, branch, http, fragments)
+
+                        break
+
+                else:
+                    yield from iter_parts(scope, part[2], http, fragments)
+
+            case 'for':
+                _, name, path, loop, otherwise = part
+                local, empty = dict(scope), True
+
+                for local[name] in (lookup(scope, path) if path[0] in scope.keys() else None) or ():
+                    empty = False
+
+                    yield from iter_parts(local, loop, http, fragments)
+
+                if empty:
+                    yield from iter_parts(scope, otherwise, http, fragments)
+
+            case 'cache':
+                _, name, keys, ttl, inner = part
+                key = (name, *(repr(lookup(scope, k) if k[0] in scope.keys() else None) for k in keys))
+
+                if (value := fragments.get(key)) is None:
+                    fragments.set(key, value := ''.join(iter_parts(scope, inner, http, fragments)), ttl)
+
+                yield value
+
+
+class Fragments(object):
+    __slots__ = ('entries', 'store', 'lock')
+
+    def __init__(self, entries: int = 1024):
+        self.entries = entries
+        self.store: OrderedDict[tuple, tuple[float | None, str]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple):
+        with self.lock:
+            if (item := self.store.get(key)) is None:
+                return None
+
+            if item[0] is not None and item[0] < time.monotonic():
+                del self.store[key]
+
+                return None
+
+            self.store.move_to_end(key)
+
+            return item[1]
+
+    def set(self, key: tuple, value: str, ttl: float | None):
+        with self.lock:
+            self.store[key] = (None if ttl is None else time.monotonic() + ttl), value
+            self.store.move_to_end(key)
+
+            while len(self.store) > self.entries:
+                self.store.popitem(False)
+
+    def clear(self):
+        with self.lock:
+            self.store.clear()
+
+
+def compile_body(body: str) -> ProgramAlias:
+    return compile_parts(body)
+
+
+def iter_program(context: dict[str, Any] | None, program: ProgramAlias, fragments: Fragments) -> Generator[str]:
+    return iter_parts(dict() if context is None else context, program, Http(), fragments)
+
+
+def program_replace(context: dict[str, Any] | None, program: ProgramAlias, fragments: Fragments):
+    return ''.join(iter_program(context, program, fragments)).rstrip()
 
 
 class Frame(object):
-    __slots__ = ('templates', 'block', 'body')
+    __slots__ = ('templates', 'files', 'block', 'body')
 
     block: dict[str, str]
     body: str
 
     def __init__(self, templates: str):
-        self.templates = templates
+        self.templates, self.files = templates, list()
 
     def get_body(self, filename: str | os.PathLike):
         filepath = os.path.abspath(os.path.join(self.templates, filename))
@@ -87,6 +379,8 @@ class Frame(object):
             body = f.read()
             f.close()
 
+            self.files.append(filepath)
+
             if extend := re.search(r'^(.*)({% extends [\'"][A-Za-z0-9_/.]+[\'"] %})(.*)(\s+)', body):
                 body = re.sub(''.join(extend.groups()), '', body)
 
@@ -192,18 +486,241 @@ class Frame(object):
         return line
 
 
+def artifact_path(templates: str):
+    return f"{os.path.normpath(templates)}.compiled"
+
+
+def dependency(templates: str, filepath: str) -> DependencyAlias:
+    stat = os.stat(filepath)
+
+    with open(filepath, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+
+    return os.path.relpath(filepath, templates).replace(os.sep, '/'), stat.st_mtime_ns, stat.st_size, digest
+
+
+def fresh_dependency(templates: str, item: DependencyAlias):
+    name, mtime, size, digest = item
+
+    try:
+        stat = os.stat(filepath := os.path.join(templates, name))
+
+        if stat.st_mtime_ns == mtime and stat.st_size == size:
+            return True
+
+        with open(filepath, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest() == digest
+
+    except OSError:
+        return False
+
+
+def compile_templates(templates: str, output: str = None):
+    entries = dict()
+
+    for root, _, names in os.walk(templates):
+        for name in names:
+            filename = os.path.relpath(os.path.join(root, name), templates).replace(os.sep, '/')
+
+            if (body := (frame := Frame(templates)).get_body(filename)) is not None:
+                entries[filename] = (
+                    body, compile_body(body), tuple(dependency(templates, f) for f in dict.fromkeys(frame.files))
+                )
+
+    temp = f"{(output := artifact_path(templates) if output is None else output)}.{os.getpid()}"
+
+    with open(temp, 'wb') as f:
+        marshal.dump((artifact_version, entries), f)
+
+    os.replace(temp, output)
+
+    return entries
+
+
+def load_templates(templates: str, artifact: str = None):
+    try:
+        with open(artifact_path(templates) if artifact is None else artifact, 'rb') as f:
+            version, entries = marshal.load(f)
+
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if artifact_version != version:
+        return None
+
+    return {
+        filename: (body, program, tuple(name for name, *_ in dependencies))
+        for filename, (body, program, dependencies) in entries.items()
+        if all(fresh_dependency(templates, item) for item in dependencies)
+    }
+
+
+def template_name(filename: str | os.PathLike) -> str | None:
+    if not (filename := os.fspath(filename).replace(os.sep, '/')) or '\0' in filename or '\\' in filename:
+        return None
+
+    if filename.startswith('/') or os.path.isabs(filename):
+        return None
+
+    if (name := posixpath.normpath(filename)) in ('.', '..') or name.startswith('../'):
+        return None
+
+    return name
+
+
 class Template(object):
-    __slots__ = ('templates', 'body')
+    __slots__ = ('templates', 'body', 'program')
 
     templates: str
+    cache: dict[str, str | None] | None = None
+    programs: dict[str, ProgramAlias] = dict()
+    fragments: Fragments = Fragments()
+    dependents: dict[str, set[str]] = dict()
+    stamps: dict[str, int | None] = dict()
+    paths: dict[str | os.PathLike, str] = dict()
+    missing: set[str | os.PathLike] = set()
+    reload: int | float | None = 1
+    checked: float = 0.0
     body: str | None
+    program: ProgramAlias
 
     def __init__(self, filename: str | os.PathLike):
-        self.body = Frame(self.templates).get_body(filename)
+        if self.reload is not None and self.reload <= time.monotonic() - self.checked:
+            self.refresh()
+
+        if (name := self.resolve(filename)) is None:
+            self.body = None
+
+        elif self.cache is not None and name in self.cache.keys():
+            self.body = self.cache[name]
+
+        else:
+            self.body = self.compile(name)
+
+        if self.body is not None:
+            if (program := self.programs.get(self.body)) is None:
+                program = self.programs.setdefault(self.body, compile_body(self.body))
+
+            self.program = program
+
+    @classmethod
+    def resolve(cls, filename: str | os.PathLike) -> str | None:
+        if (name := cls.paths.get(filename)) is None and filename not in cls.missing:
+            if (name := template_name(filename)) is not None and os.path.isfile(os.path.join(cls.templates, name)):
+                if 1024 <= len(cls.paths):
+                    cls.paths.clear()
+
+                cls.paths[filename] = name
+
+            else:
+                if 1024 <= len(cls.missing):
+                    cls.missing.clear()
+
+                cls.missing.add(filename)
+
+                name = None
+
+        return name
+
+    @classmethod
+    def stamp(cls, name: str) -> int | None:
+        try:
+            return os.stat(os.path.join(cls.templates, name)).st_mtime_ns
+
+        except OSError:
+            return None
+
+    @classmethod
+    def track(cls, filename: str | os.PathLike, names: Iterable[str]):
+        for name in (filename, *names):
+            cls.dependents.setdefault(name, set()).add(filename)
+
+            if name not in cls.stamps.keys():
+                cls.stamps[name] = cls.stamp(name)
+
+    @classmethod
+    def compile(cls, filename: str | os.PathLike) -> str | None:
+        body = (frame := Frame(cls.templates)).get_body(filename)
+
+        if cls.cache is None:
+            cls.cache = dict()
+
+        cls.cache[filename] = body
+        cls.track(filename, (os.path.relpath(f, cls.templates).replace(os.sep, '/') for f in frame.files))
+
+        if body is not None:
+            cls.programs.setdefault(body, compile_body(body))
+
+        return body
+
+    @classmethod
+    def invalidate(cls, name: str) -> set[str]:
+        cls.stamps.pop(name, None)
+
+        for filename in (dependents := cls.dependents.pop(name, set())):
+            if cls.cache is not None and (body := cls.cache.pop(filename, None)) is not None:
+                cls.programs.pop(body, None)
+
+        return dependents
+
+    @classmethod
+    def refresh(cls) -> set[str]:
+        cls.checked, invalidated = time.monotonic(), set()
+        cls.missing.clear()
+
+        for name, stamp in tuple(cls.stamps.items()):
+            if cls.stamp(name) != stamp:
+                invalidated |= cls.invalidate(name)
+
+        return invalidated
+
+    @classmethod
+    def load(cls):
+        if (entries := load_templates(cls.templates)) is not None:
+            cls.cache = {filename: body for filename, (body, *_) in entries.items()}
+
+            for filename, (body, program, names) in entries.items():
+                cls.programs.setdefault(body, program)
+                cls.track(filename, names)
+
+    @classmethod
+    def preload(cls):
+        if cls.cache is None:
+            cls.load()
+
+        else:
+            cls.refresh()
+
+        for root, _, names in os.walk(cls.templates):
+            for name in names:
+                filename = os.path.relpath(os.path.join(root, name), cls.templates).replace(os.sep, '/')
+
+                if cls.cache is None or filename not in cls.cache.keys():
+                    cls.compile(filename)
+
+        if cls.cache is None:
+            cls.cache = dict()
 
     def render(self, context: dict[str, str] | None):
         if self.body is None:
             return b'Template file not found.'
 
-        else:
-            return context_replace(context, self.body)
+        return program_replace(context, self.program, self.fragments)
+
+    def stream(self, context: dict[str, Any] | None, buffer_size: int = 8192) -> Generator[str]:
+        if self.body is None:
+            yield 'Template file not found.'
+
+            return
+
+        buffer, size = list(), 0
+
+        for part in iter_program(context, self.program, self.fragments):
+            buffer.append(part)
+
+            if (size := size + len(part)) >= buffer_size:
+                yield ''.join(buffer)
+
+                buffer, size = list(), 0
+
+        yield ''.join(buffer).rstrip()
@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from contextvars import ContextVar
+from typing import Any, Literal
+
+from . import response
+
+_sessions: 'Sessions | None' = None
+_session: ContextVar['Session | None'] = ContextVar('session', default=None)
+
+
+def encode(data: bytes):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def decode(data: str):
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class Sessions(object):
+    __slots__ = ('keys', 'name', 'max_age', 'path', 'domain', 'secure', 'httponly', 'samesite')
+
+    def __init__(
+            self,
+            keys: str | bytes | tuple[str | bytes, ...],
+            name: str = 'session',
+            max_age: int = None,
+            path: str = '/',
+            domain: str = None,
+            secure: bool = False,
+            httponly: bool = True,
+            samesite: Literal['none', 'lax', 'strict'] | None = 'lax',
+    ):
+        if isinstance(keys, str | bytes):
+            keys = (keys,)
+
+        if not keys:
+            raise ValueError('Session. At least one secret key is required.')
+
+        for attr, value in (
+                ('keys', tuple(k.encode('utf-8') if isinstance(k, str) else k for k in keys)),
+                ('name', name),
+                ('max_age', max_age),
+                ('path', path),
+                ('domain', domain),
+                ('secure', secure),
+                ('httponly', httponly),
+                ('samesite', samesite),
+        ):
+            setattr(self, attr, value)
+
+    @staticmethod
+    def signature(key: bytes, message: bytes):
+        return hmac.new(key, message, hashlib.sha256).digest()[:16]
+
+    def dumps(self, data: dict[str, Any]):
+        message = f"{encode(json.dumps(data, separators=(',', ':')).encode('utf-8'))}.{int(time.time()):x}"
+
+        return f"{message}.{encode(self.signature(self.keys[0], message.encode('ascii')))}"
+
+    def loads(self, value: str) -> dict[str, Any] | None:
+        message, _, signature = value.rpartition('.')
+
+        try:
+            signature = decode(signature)
+
+            if not any(hmac.compare_digest(self.signature(k, message.encode('ascii')), signature) for k in self.keys):
+                return None
+
+            payload, timestamp = message.split('.')
+
+            if self.max_age is not None and int(timestamp, 16) + self.max_age < time.time():
+                return None
+
+            data = json.loads(decode(payload))
+
+        except (ValueError, UnicodeError):
+            return None
+
+        return data if isinstance(data, dict) else None
+
+
+class Session(object):
+    __slots__ = ('value', 'data', 'modified')
+
+    def __init__(self, value: str | None):
+        self.value, self.data, self.modified = value, None, False
+
+    def load(self) -> dict[str, Any]:
+        if self.data is None:
+            if self.value:
+                self.data = _sessions.loads(self.value) or dict()
+
+            else:
+                self.data = dict()
+
+        return self.data
+
+    def save(self):
+        if self.modified:
+            self.modified = False
+
+            if self.data:
+                response.set_cookie(
+                    _sessions.name,
+                    _sessions.dumps(self.data),
+                    max_age=_sessions.max_age,
+                    path=_sessions.path,
+                    domain=_sessions.domain,
+                    secure=_sessions.secure,
+                    httponly=_sessions.httponly,
+                    samesite=_sessions.samesite,
+                )
+
+            elif self.value:
+                response.delete_cookie(_sessions.name, _sessions.path, _sessions.domain)
+
+
+def current() -> Session:
+    if (session := _session.get()) is None:
+        raise RuntimeError('Session. Sessions are not configured for this application.')
+
+    return session
+
+
+def get_session(name: str, default: Any = None):
+    return current().load().get(name, default)
+
+
+def has_session(name: str):
+    return name in current().load().keys()
+
+
+def set_session(name: str, value: Any):
+    (session := current()).load()[name] = value
+    session.modified = True
+
+
+def delete_session(name: str):
+    if name in (data := (session := current()).load()).keys():
+        del data[name]
+
+        session.modified = True
+
+
+def clear_session():
+    if (session := current()).load() or session.value:
+        session.data, session.modified = dict(), True
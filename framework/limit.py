@@ -0,0 +1,202 @@
+import hashlib
+import math
+import mmap
+import multiprocessing
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from .alias import WSGIEnvironment
+
+
+def client(environ: WSGIEnvironment, header: str | None, proxies: int = 1):
+    if header is not None and (value := environ.get(header)):
+        if proxies <= len(hops := value.split(',')):
+            return hops[-proxies].strip()
+
+    return environ.get('REMOTE_ADDR', '')
+
+
+def as_proxies(proxies: int):
+    if 1 > proxies:
+        raise ValueError('Client. Trusted proxies must be a positive number: %s.' % proxies)
+
+    return proxies
+
+
+def as_header(header: str | None):
+    return None if header is None else f"HTTP_{header.upper().replace('-', '_')}"
+
+
+class Misses(object):
+    __slots__ = ('ttl', 'entries', 'store', 'lock')
+
+    def __init__(self, ttl: int | float = 60, entries: int = 4096):
+        if 0 >= ttl:
+            raise ValueError('Negative cache. TTL must be a positive number: %s.' % ttl)
+
+        self.ttl, self.entries = ttl, entries
+        self.store: OrderedDict[str, float] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(environ: WSGIEnvironment):
+        return f"{environ.get('HTTP_HOST', '')}{environ['PATH_INFO']}"
+
+    def __contains__(self, environ: WSGIEnvironment):
+        if (expires := self.store.get(key := self.key(environ))) is None:
+            return False
+
+        if expires < time.monotonic():
+            with self.lock:
+                self.store.pop(key, None)
+
+            return False
+
+        return True
+
+    def add(self, environ: WSGIEnvironment):
+        with self.lock:
+            self.store[key := self.key(environ)] = time.monotonic() + self.ttl
+            self.store.move_to_end(key)
+
+            while len(self.store) > self.entries:
+                self.store.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.store.clear()
+
+
+class RateLimit(object):
+    __slots__ = ('rate', 'burst', 'header', 'proxies', 'entries', 'store', 'lock')
+
+    def __init__(
+            self, rate: int | float, burst: int = None, header: str = None, proxies: int = 1, entries: int = 65536
+    ):
+        if 0 >= rate:
+            raise ValueError('Rate limit. Rate must be a positive number: %s.' % rate)
+
+        for attr, value in (
+                ('rate', rate),
+                ('burst', max(1, math.ceil(rate)) if burst is None else burst),
+                ('header', as_header(header)),
+                ('proxies', as_proxies(proxies)),
+                ('entries', entries),
+                ('store', OrderedDict()),
+                ('lock', threading.Lock()),
+        ):
+            setattr(self, attr, value)
+
+    def take(self, environ: WSGIEnvironment) -> int:
+        key, now = client(environ, self.header, self.proxies), time.monotonic()
+
+        with self.lock:
+            if (bucket := self.store.get(key)) is None:
+                tokens = self.burst
+
+                while len(self.store) >= self.entries:
+                    self.store.popitem(last=False)
+
+            else:
+                tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+                self.store.move_to_end(key)
+
+            if 1 <= tokens:
+                self.store[key] = (tokens - 1, now)
+
+                return 0
+
+            self.store[key] = (tokens, now)
+
+        return math.ceil((1 - tokens) / self.rate)
+
+
+class Quota(object):
+    __slots__ = ('requests', 'period', 'header', 'proxies', 'key', 'slots', 'memory', 'lock')
+
+    slot = struct.Struct('=QqII')
+    probes = 4
+
+    def __init__(
+            self,
+            requests: int,
+            period: int | float = 1,
+            header: str = None,
+            proxies: int = 1,
+            key: str = None,
+            slots: int = 4096,
+    ):
+        if 0 >= requests:
+            raise ValueError('Quota. Requests must be a positive number: %s.' % requests)
+
+        if 0 >= period:
+            raise ValueError('Quota. Period must be a positive number: %s.' % period)
+
+        for attr, value in (
+                ('requests', requests),
+                ('period', period),
+                ('header', as_header(header)),
+                ('proxies', as_proxies(proxies)),
+                ('key', as_header(key)),
+                ('slots', slots),
+                ('memory', mmap.mmap(-1, slots * self.slot.size)),
+                ('lock', multiprocessing.Lock()),
+        ):
+            setattr(self, attr, value)
+
+    @staticmethod
+    def tag(key: str):
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') | 1
+
+    def tags(self, environ: WSGIEnvironment):
+        tags = [self.tag(client(environ, self.header, self.proxies))]
+
+        if self.key is not None and (value := environ.get(self.key)):
+            tags.append(self.tag(f"key:{value}"))
+
+        return tags
+
+    def find(self, tag: int, window: int):
+        first, free = tag % self.slots, None
+
+        for i in range(self.probes):
+            stored, start, current, previous = self.slot.unpack_from(
+                self.memory, offset := (first + i) % self.slots * self.slot.size
+            )
+
+            if stored == tag:
+                return offset, start, current, previous
+
+            if start < window and (free is None or start < free[1]):
+                free = offset, start
+
+        return None if free is None else (free[0], window, 0, 0)
+
+    def take(self, environ: WSGIEnvironment) -> int:
+        window, elapsed = divmod(time.time(), self.period)
+        window, counters, retry_after = int(window), list(), max(1, math.ceil(self.period - elapsed))
+
+        with self.lock:
+            for tag in self.tags(environ):
+                if (found := self.find(tag, window)) is None:
+                    return retry_after
+
+                offset, start, current, previous = found
+
+                if start != window:
+                    current, previous = 0, current if window - 1 == start else 0
+
+                self.slot.pack_into(self.memory, offset, tag, window, current, previous)
+
+                if previous * (1 - elapsed / self.period) + current >= self.requests:
+                    return retry_after
+
+                counters.append((offset, tag, current, previous))
+
+            for offset, tag, current, previous in counters:
+                self.slot.pack_into(self.memory, offset, tag, window, current + 1, previous)
+
+        return 0
@@ -2,10 +2,16 @@ import io
 import os
 import sys
 from collections.abc import Callable, Iterable
+from typing import Any
 
-from .alias import StartResponse, WSGIEnvironment, WSGIApplication
-from .routing import Map
-from .routing.kernel import Kernel, Static, Router
+from .alias import StartResponse, WSGIEnvironment, WSGIApplication, WSGIGenerator
+from .executor import Pool, Processes
+from .http.response.encoder import encoder
+from .http.response.template import Fragments
+from .http.session import Sessions
+from .limit import Misses, Quota, RateLimit
+from .routing import Map, Middleware
+from .routing.kernel import Kernel, File, Static, Router
 
 
 def valid_static(urlpath: str | None):
@@ -44,7 +50,7 @@ def as_import(error_handler: Callable | tuple[Callable] | tuple[Callable, str] |
 
 
 class Main(object):
-    __slots__ = ('static', 'router')
+    __slots__ = ('static', 'router', 'limit')
 
     def __init__(
             self: WSGIApplication,
@@ -54,6 +60,18 @@ class Main(object):
             static_urlpath: str = None,
             static_folder: str | os.PathLike = None,
             template_folder: str | os.PathLike = None,
+            etag: bool = False,
+            chunk_size: int = None,
+            json_encoder: str | Callable[[Any], bytes] = None,
+            pool: Pool = None,
+            processes: Processes = None,
+            sessions: Sessions = None,
+            fragments: Fragments = None,
+            template_reload: int | float | None = 1,
+            static_errors: bool = False,
+            misses: Misses = None,
+            rate_limit: Quota | RateLimit = None,
+            middleware: tuple[Middleware, ...] = (),
     ):
         dirname = os.path.dirname(sys.modules[import_name].__file__)
 
@@ -67,13 +85,49 @@ class Main(object):
             as_import(error_handler),
             static_urlpath,
             absolute_path(dirname, template_folder, 'templates'),
+            pool,
+            processes,
+            sessions,
+            fragments,
+            template_reload,
+            static_errors,
+            misses,
+            middleware,
         )
 
-        for attr, value in (('encoding', 'utf-8'), ('buffer_size', io.DEFAULT_BUFFER_SIZE)):
+        self.limit = rate_limit
+
+        for attr, value in (
+                ('encoding', 'utf-8'),
+                ('buffer_size', io.DEFAULT_BUFFER_SIZE),
+                ('chunk_size', chunk_size),
+                ('etag', etag),
+                ('dumps', staticmethod(encoder(json_encoder))),
+        ):
             setattr(Kernel, attr, value)
 
     def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
         if self.static.isfile(environ):
-            return self.static.file(start_response)
+            file: File = self.static.file
+            file.head = 'HEAD' == environ.get('REQUEST_METHOD')
+
+            return file(start_response)
+
+        if (rejected := self.screen(environ)) is not None:
+            return rejected(start_response)
 
         return self.router(environ)(start_response)
+
+    def screen(self, environ: WSGIEnvironment) -> WSGIGenerator | None:
+        if self.limit is not None and (retry_after := self.limit.take(environ)):
+            return self.router.reject(environ, 429, [('retry-after', str(retry_after))])
+
+        if self.router.misses is not None and environ in self.router.misses:
+            return self.router.reject(environ, 404)
+
+    def preload(self):
+        self.static.index()
+        self.router.preload()
+
+    def fork(self):
+        self.router.fork()
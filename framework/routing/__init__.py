@@ -1,23 +1,102 @@
 import re
 from collections.abc import Callable
+from fnmatch import fnmatchcase
+from typing import Any
 
+from ..cache import Cache
+from ..limit import Quota, RateLimit
 
-class Rule(object):
-    __slots__ = ('path', 'link', 'tokens')
 
-    def __init__(self, path: str, link: str, tokens: dict[str, str | tuple[int, str]] = None):
+def rule_error(message: str, *args):
+    if args:
+        message = message % args
+
+    return ValueError(f"URL Map. Rule. {message}.")
+
+
+def tokenize(path: str, pattern: str, path_tokens: dict[str, str | tuple[int, str]], default: str):
+    keys, types = tuple(), tuple()
+
+    for key in re.findall(r'<([A-Za-z0-9:_,)(]+)>', path):
+        if 1 < len(s := str(key).split(':', 1)):
+            (raw_flag, key), replace = s, key
+
+            if 'int' == raw_flag:
+                flag, value = 1, r'\d+'
+
+            elif r := re.findall(r'^int\(([0-9,]+)\)$', raw_flag):
+                flag, value, raw_flag = 1, r'\d{%s}' % r[0], 'int'
+
+            else:
+                flag, value = 2, r'\d+\.\d+'
+
+            if raw_flag not in ('int', 'float'):
+                raise rule_error("Path token has an invalid flag: '%s'", replace)
+
+            path = path.replace(f"<{replace}>", f"<{key}>")
+            pattern = pattern.replace(f"<{replace}>", f"({value})")
+
+        else:
+            flag, value = 0, path_tokens.pop(key, None)
+
+            if value is None:
+                value = default
+
+            if isinstance(value, tuple):
+                flag, value = value
+
+            if flag not in (0, 1, 2):
+                raise rule_error("The added token has an invalid type flag: (%s, '%s')", flag, value)
+
+            pattern = pattern.replace(f"<{key}>", f"({value})")
+
+        keys = (*keys, key)
+        types = (*types, (flag, key))
+
+    return path, pattern, keys, types
+
+
+class Rule(object):
+    __slots__ = ('path', 'link', 'tokens', 'methods', 'host')
+
+    def __init__(
+            self,
+            path: str,
+            link: str,
+            tokens: dict[str, str | tuple[int, str]] = None,
+            methods: tuple[str, ...] = None,
+            host: str = None,
+    ):
         for attr, value in (
                 ('path', path),
                 ('link', link),
                 ('tokens', dict() if tokens is None else tokens),
+                ('methods', None if methods is None else tuple(m.upper() for m in methods)),
+                ('host', host),
         ):
             setattr(self, attr, value)
 
 
 class Endpoint(object):
-    __slots__ = ('link', 'module', 'name', 'method', 'args')
+    __slots__ = ('link', 'module', 'name', 'method', 'args', 'cache', 'executor', 'limit')
+
+    def __init__(
+            self,
+            link: str,
+            endpoint: Callable | tuple[Callable] | tuple[Callable, str],
+            *args,
+            cache: Cache = None,
+            blocking: bool = False,
+            process: bool = False,
+            concurrency: int = None,
+            limit: Quota | RateLimit = None,
+    ):
+        if blocking and process:
+            raise ValueError("URL Map. Endpoint. Endpoint cannot be both blocking and process: '%s'." % link)
+
+        if concurrency is not None and not process:
+            raise ValueError("URL Map. Endpoint. Concurrency is only available for process: '%s'." % link)
 
-    def __init__(self, link: str, endpoint: Callable | tuple[Callable] | tuple[Callable, str], *args):
         if isinstance(obj := endpoint, tuple):
             obj, method = obj[0], obj[1] if 2 == len(obj) else '__call__'
 
@@ -30,18 +109,56 @@ class Endpoint(object):
                 ('name', obj.__name__),
                 ('method', method),
                 ('args', args),
+                ('cache', cache),
+                ('executor', ('thread', None) if blocking else ('process', concurrency) if process else None),
+                ('limit', limit),
+        ):
+            setattr(self, attr, value)
+
+
+class Middleware(object):
+    __slots__ = ('call', 'links', 'exclude')
+
+    def __init__(
+            self,
+            call: Callable[..., Any],
+            links: str | tuple[str, ...] = '*',
+            exclude: str | tuple[str, ...] = (),
+    ):
+        if not callable(call):
+            raise ValueError("URL Map. Middleware. Middleware must be callable: '%s'." % call)
+
+        for attr, value in (
+                ('call', call),
+                ('links', (links,) if isinstance(links, str) else links),
+                ('exclude', (exclude,) if isinstance(exclude, str) else exclude),
+        ):
+            setattr(self, attr, value)
+
+    def applies(self, link: str):
+        return any(fnmatchcase(link, p) for p in self.links) and not any(fnmatchcase(link, p) for p in self.exclude)
+
+
+class Mount(object):
+    __slots__ = ('prefix', 'urlmap', 'namespace')
+
+    def __init__(self, prefix: str, urlmap: 'Map', namespace: str = None):
+        for attr, value in (
+                ('prefix', prefix),
+                ('urlmap', urlmap),
+                ('namespace', prefix.strip('/') if namespace is None else namespace),
         ):
             setattr(self, attr, value)
 
 
 class Map(object):
-    __slots__ = ('link', 'pattern', 'callback')
+    __slots__ = ('link', 'pattern', 'host', 'mount', 'callback', 'cache', 'executor', 'limit')
 
-    def __init__(self, rules: tuple[Rule | Endpoint, ...]):
+    def __init__(self, rules: tuple[Rule | Endpoint | Mount, ...]):
         def generator():
             return (getattr(line, a) for a in line.__slots__)
 
-        for attr in ('link', 'pattern', 'callback'):
+        for attr in ('link', 'pattern', 'host', 'mount', 'callback', 'cache', 'executor', 'limit'):
             setattr(self, attr, dict())
 
         for line in rules:
@@ -50,74 +167,143 @@ class Map(object):
                     self.rule(*generator())
 
                 case 'Endpoint':
-                    link, module, name, method, args = generator()
+                    link, module, name, method, args, cache, executor, limit = generator()
 
                     if link in self.callback.keys():
                         raise ValueError("URL Map. Endpoint. Link already exists in endpoint list: '%s'." % link)
 
                     self.callback[link] = module, name, method, args
 
-    def rule(self, path: str, link: str, path_tokens: dict[str, str]):
-        def msg(message: str, *args):
-            if args:
-                message = message % args
+                    if cache is not None:
+                        self.cache[link] = cache
+
+                    if executor is not None:
+                        self.executor[link] = executor
+
+                    if limit is not None:
+                        self.limit[link] = limit
+
+                case 'Mount':
+                    self.mount_map(*generator())
+
+    def mount_map(self, prefix: str, urlmap: 'Map', namespace: str):
+        if not re.match(r'^/[A-Za-z0-9_.~-]+$', prefix):
+            raise ValueError("URL Map. Mount. Prefix must be a single path segment: '%s'." % prefix)
+
+        if prefix in self.mount.keys():
+            raise ValueError("URL Map. Mount. Prefix already exists in mount list: '%s'." % prefix)
+
+        self.mount[prefix] = urlmap = urlmap.namespaced(namespace)
+
+        for link, items in urlmap.link.items():
+            if link in self.link.keys():
+                raise ValueError("URL Map. Mount. Link already exists in link list: '%s'." % link)
+
+            self.link[link] = tuple(
+                (f"^{re.escape(prefix)}{pattern[1:]}", f"{prefix}{path}", keys) for pattern, path, keys in items
+            )
 
-            return ValueError(f"URL Map. Rule. {message}.")
+        for link, callback in urlmap.callback.items():
+            if link in self.callback.keys():
+                raise ValueError("URL Map. Endpoint. Link already exists in endpoint list: '%s'." % link)
 
+            self.callback[link] = callback
+
+        self.cache.update(urlmap.cache)
+        self.executor.update(urlmap.executor)
+        self.limit.update(urlmap.limit)
+
+    def namespaced(self, namespace: str):
+        def name(link: str):
+            return f"{namespace}.{link}"
+
+        def table(patterns: dict[str, tuple[str | dict[str, str], tuple[tuple[int, str], ...]]]):
+            return {
+                pattern: ({k: name(v) for k, v in t.items()} if isinstance(t, dict) else name(t), types)
+                for pattern, (t, types) in patterns.items()
+            }
+
+        urlmap = Map(())
+
+        for attr, value in (
+                ('link', {name(k): v for k, v in self.link.items()}),
+                ('pattern', table(self.pattern)),
+                ('host', {k: table(v) for k, v in self.host.items()}),
+                ('mount', {k: v.namespaced(namespace) for k, v in self.mount.items()}),
+                ('callback', {name(k): v for k, v in self.callback.items()}),
+                ('cache', {name(k): v for k, v in self.cache.items()}),
+                ('executor', {name(k): v for k, v in self.executor.items()}),
+                ('limit', {name(k): v for k, v in self.limit.items()}),
+        ):
+            setattr(urlmap, attr, value)
+
+        return urlmap
+
+    def rule(
+            self,
+            path: str,
+            link: str,
+            path_tokens: dict[str, str],
+            methods: tuple[str, ...] | None,
+            host: str | None,
+    ):
         if '' == path:
-            raise msg('Path must not be an empty string')
+            raise rule_error('Path must not be an empty string')
 
         if not path.startswith('/'):
-            raise msg("Path must start slash: '%s'", path)
+            raise rule_error("Path must start slash: '%s'", path)
 
-        raw_path, pattern, keys, types = path, f"^{path}$", tuple(), tuple()
+        raw_path, (path, pattern, keys, types) = path, tokenize(path, f"^{path}$", path_tokens, r'[A-Za-z0-9_-]+')
 
-        for key in re.findall(r'<([A-Za-z0-9:_,)(]+)>', path):
-            if 1 < len(s := str(key).split(':', 1)):
-                (raw_flag, key), replace = s, key
+        if host is None:
+            table = self.pattern
 
-                if 'int' == raw_flag:
-                    flag, value = 1, r'\d+'
+        else:
+            if '' == host or '/' in host:
+                raise rule_error("Host must be a bare domain name: '%s'", host)
 
-                elif r := re.findall(r'^int\(([0-9,]+)\)$', raw_flag):
-                    flag, value, raw_flag = 1, r'\d{%s}' % r[0], 'int'
+            if '<' in (host := host.lower()):
+                _, host, _, host_types = tokenize(
+                    host, '^%s$' % host.replace('.', r'\.'), path_tokens, r'[A-Za-z0-9-]+'
+                )
 
-                else:
-                    flag, value = 2, r'\d+\.\d+'
+                if duplicate := [k for _, k in host_types if k in keys]:
+                    raise rule_error("Host and path tokens must not share names: %s", ', '.join(duplicate))
 
-                if raw_flag not in ('int', 'float'):
-                    raise msg("Path token has an invalid flag: '%s'", replace)
+                types = (*host_types, *types)
 
-                path = path.replace(f"<{replace}>", f"<{key}>")
-                pattern = pattern.replace(f"<{replace}>", f"({value})")
+            table = self.host.setdefault(host, dict())
 
-            else:
-                flag, value = 0, path_tokens.pop(key, None)
+        if {} != path_tokens:
+            raise rule_error('Tokens added to rules have unused values: %s', path_tokens)
 
-                if value is None:
-                    value = r'[A-Za-z0-9_-]+'
+        if methods is not None:
+            if not methods:
+                raise rule_error("Rule methods must not be empty: '%s'", raw_path)
 
-                if isinstance(value, tuple):
-                    flag, value = value
+            target = dict.fromkeys(methods, link)
 
-                if flag not in (0, 1, 2):
-                    raise msg("The added token has an invalid type flag: (%s, '%s')", flag, value)
+            if pattern in table.keys():
+                if isinstance(exists := table[pattern][0], dict):
+                    if duplicate := [m for m in methods if m in exists.keys()]:
+                        raise rule_error("Path already exists for methods %s: '%s'", ', '.join(duplicate), raw_path)
 
-                pattern = pattern.replace(f"<{key}>", f"({value})")
+                    target = {**exists, **target}
 
-            keys = (*keys, key)
-            types = (*types, (flag, key))
+                else:
+                    raise rule_error("Path already exists in pattern list: '%s'", raw_path)
 
-        if {} != path_tokens:
-            raise msg('Tokens added to rules have unused values: %s', path_tokens)
+        elif pattern in table.keys():
+            raise rule_error("Path already exists in pattern list: '%s'", raw_path)
 
-        if pattern in self.pattern.keys():
-            raise msg("Path already exists in pattern list: '%s'", raw_path)
+        else:
+            target = link
 
         if link in self.link.keys():
-            self.link[link] = (*self.link[link], (pattern, path, keys))
+            if (pattern, path, keys) not in self.link[link]:
+                self.link[link] = (*self.link[link], (pattern, path, keys))
 
         else:
             self.link[link] = ((pattern, path, keys),)
 
-        self.pattern[pattern] = link, types
+        table[pattern] = target, types
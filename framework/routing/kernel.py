@@ -1,72 +1,109 @@
+import functools
 import mimetypes
 import os
 import sys
-from collections.abc import Callable, Generator
+import traceback
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Future
+from http import HTTPStatus
 from typing import Any
 
-from . import Map
-from .map import Link, Pattern, Callback
+from . import Map, Middleware
+from ..cache import Cache, EntryAlias
+from ..executor import Pool, Processes
+from .map import Link, Dispatch, Callback
 from ..alias import HeadersAlias, StartResponse, WSGIEnvironment, WSGIGenerator
-from ..http import request, response, Query, Cookie, Form
-from ..http.response.header import Header
-from ..http.response.template import Template
+from ..http import request, response, session, Query, Cookie, Form
+from ..http.response.encoder import iterencode, DumpsAlias
+from ..http.response.event import EventStream
+from ..http.response.header import weak_etag, validators, not_modified, Header
+from ..http.response.template import Fragments, Template
+from ..http.session import Session, Sessions
+from ..limit import Misses
 
 status_codes = {
-    200: '200 OK',
-    301: '301 Moved Permanently',
+    **{s.value: f"{s.value} {s.phrase}" for s in HTTPStatus},
     302: '302 Moved Temporarily',
-    307: '307 Temporary Redirect',
-    308: '308 Permanent Redirect',
-    403: '403 Forbidden',
-    404: '404 Not Found',
-    500: '500 Internal Server Error',
     520: '520 Unknown Error',
 }
 
+content_types: dict[tuple[str | None, str | None], str] = dict()
+type_headers: dict[str, tuple[str, str]] = dict()
+length_headers: dict[int, tuple[str, str]] = dict()
+
 
 def status(code: int):
-    return status_codes[code if code in status_codes.keys() else 520]
+    return status_codes.get(code) or status_codes[520]
+
+
+def content_type(mimetype: str | None, encoding: str | None):
+    if (value := content_types.get(key := (mimetype, encoding))) is None:
+        if mimetype is None:
+            mimetype = 'text/plain'
+
+        if encoding is not None and mimetype.startswith('text/'):
+            mimetype = f"{mimetype}; charset={encoding}"
+
+        value = content_types.setdefault(key, mimetype)
+
+    return value
+
+
+def type_header(mimetype: str):
+    if (pair := type_headers.get(mimetype)) is None:
+        pair = type_headers.setdefault(mimetype, ('content-type', mimetype))
+
+    return pair
+
+
+def length_header(size: int):
+    if (pair := length_headers.get(size)) is None:
+        if 1024 <= len(length_headers):
+            length_headers.clear()
+
+        pair = length_headers[size] = ('content-length', str(size))
+
+    return pair
 
 
 class Kernel(object):
-    __slots__ = ('encoding', 'buffer_size', 'size', 'headers', 'mimetype')
+    __slots__ = ('encoding', 'buffer_size', 'chunk_size', 'etag', 'dumps', 'size', 'headers', 'mimetype', 'head')
 
     encoding: str
     buffer_size: int
-    size: int
+    chunk_size: int | None
+    etag: bool
+    dumps: DumpsAlias
+    size: int | None
     headers: HeadersAlias
     mimetype: str
+    head: bool
 
     def mime(self, mimetype: str | None, encoding: str | None):
-        if mimetype is None:
-            mimetype = 'text/plain'
-
-        if mimetype.startswith('text/'):
-            if 0 < self.size:
-                if encoding is None:
-                    encoding = self.encoding
+        if 0 != self.size:
+            self.mimetype = content_type(mimetype, self.encoding if encoding is None else encoding)
 
-                mimetype = f"{mimetype}; charset={encoding}"
-
-        self.mimetype = mimetype
+        else:
+            self.mimetype = content_type(mimetype, None)
 
     def content_header(self, mimetype: str):
-        self.headers.extend([('content-length', str(self.size)), ('content-type', mimetype)])
-
-        return self.headers
+        return [*self.headers, length_header(self.size), type_header(mimetype)]
 
 
 class File(Kernel):
     __slots__ = ('file',)
 
-    def __init__(self, file: str):
-        self.file, self.size, self.headers = file, os.path.getsize(file), HeadersAlias()
+    def __init__(self, file: str, head: bool = False):
+        self.file, self.size, self.headers, self.head = file, os.path.getsize(file), HeadersAlias(), head
 
         self.mime(*mimetypes.guess_type(file, strict=True))
 
     def __call__(self, start_response: StartResponse) -> Generator[bytes]:
         start_response(status(200), self.content_header(self.mimetype))
 
+        if self.head:
+            return
+
         try:
             f = open(self.file, 'rb')
             for i in range(0, self.size, self.buffer_size):
@@ -93,10 +130,26 @@ class Body(Kernel):
             if isinstance(body, str):
                 body = body.encode(encoding := self.encoding if encoding is None else encoding)
 
+            elif isinstance(body, dict | list):
+                body = self.dumps(body)
+
+                if mimetype is None:
+                    mimetype = 'application/json'
+
+            elif isinstance(body, EventStream):
+                body = body(self.dumps)
+
+            elif isinstance(body, Iterator):
+                if 'application/json' == mimetype:
+                    body = iterencode(self.dumps, body, self.buffer_size)
+
+                else:
+                    body = self.stream(body, self.encoding if encoding is None else encoding)
+
             else:
                 body = b''
 
-        self.size = len(body)
+        self.size = None if isinstance(body, Iterator) else len(body)
 
         if code is None:
             code = 200
@@ -104,47 +157,179 @@ class Body(Kernel):
         if headers is None:
             headers = HeadersAlias()
 
-        header: Header = getattr(response, '_header')
+        if (current := getattr(session, '_session').get()) is not None:
+            current.save()
+
+        header: Header = getattr(response, '_header').get()
 
         headers.extend(header.headers())
         headers.extend(header.cookies())
 
+        if 200 == code:
+            etag, last_modified = validators(headers)
+
+            if etag is None and self.etag and self.size is not None:
+                headers.append(('etag', etag := weak_etag(body)))
+
+            if not_modified(getattr(request, '_env').get(), etag, last_modified):
+                code = 304
+
+        if 304 == code:
+            if self.size is None:
+                body.close()
+
+            body, self.size = b'', 0
+
+        self.head = 'HEAD' == getattr(request, '_env').get().get('REQUEST_METHOD')
+
         self.mime(mimetype, encoding)
 
         self.body, self.code, self.headers = body, code, headers
 
-    def __call__(self, start_response: StartResponse) -> Generator[bytes]:
+    def content_header(self, mimetype: str):
+        if 304 == self.code:
+            return list(self.headers)
+
+        if self.size is None:
+            return [*self.headers, type_header(mimetype)]
+
+        return Kernel.content_header(self, mimetype)
+
+    def __call__(self, start_response: StartResponse) -> Iterable[bytes]:
         start_response(status(self.code), self.content_header(self.mimetype))
 
-        for i in range(0, self.size, self.buffer_size):
-            yield self.body[i:i + self.buffer_size]
+        if self.size is None:
+            if self.head:
+                self.body.close()
+
+                return []
+
+            return self.body
+
+        if self.head or 0 == self.size:
+            return []
+
+        if self.chunk_size and self.size > self.chunk_size:
+            return self.chunks()
+
+        return [self.body]
+
+    def chunks(self) -> Generator[bytes]:
+        for i in range(0, self.size, self.chunk_size):
+            yield self.body[i:i + self.chunk_size]
+
+    @staticmethod
+    def stream(chunks: Iterator[str | bytes], encoding: str) -> Generator[bytes]:
+        try:
+            for chunk in chunks:
+                yield chunk.encode(encoding) if isinstance(chunk, str) else chunk
+
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    @property
+    def entry(self) -> EntryAlias:
+        return status(self.code), self.content_header(self.mimetype), self.body
+
+
+class Cached(object):
+    __slots__ = ('status', 'headers', 'body')
+
+    def __init__(self, status_line: str, headers: HeadersAlias, body: bytes):
+        self.status, self.headers, self.body = status_line, headers, body
+
+    def __call__(self, start_response: StartResponse) -> Iterable[bytes]:
+        if not_modified(getattr(request, '_env').get(), *validators(self.headers)):
+            start_response(status(304), [
+                (k, v) for k, v in self.headers if k not in ('content-length', 'content-type')
+            ])
+
+            return []
+
+        start_response(self.status, list(self.headers))
+
+        if self.body and 'HEAD' != getattr(request, '_env').get().get('REQUEST_METHOD'):
+            return [self.body]
+
+        return []
 
 
 class Static(object):
-    __slots__ = ('isdir', 'folder', 'urlpath', 'filepath')
+    __slots__ = ('isdir', 'folder', 'urlpath', 'files', 'filepath')
 
     filepath: str
 
     def __init__(self, folder: str, urlpath: str):
-        self.isdir = os.path.isdir(folder)
+        self.isdir, self.files = os.path.isdir(folder), None
 
         if self.isdir:
             self.folder, self.urlpath = folder, urlpath
 
     def isfile(self, environ: WSGIEnvironment):
+        if (filepath := self.find(environ['PATH_INFO'])) is not None:
+            self.filepath = filepath
+
+            return True
+
+    def index(self):
         if self.isdir:
-            path_info = environ['PATH_INFO']
+            files = dict()
+
+            for root, _, names in os.walk(self.folder):
+                for name in names:
+                    filepath = os.path.join(root, name)
+
+                    files[f"{self.urlpath}{os.path.relpath(filepath, self.folder).replace(os.sep, '/')}"] = filepath
+
+            self.files = files
 
-            if path_info.startswith(self.urlpath):
-                self.filepath: str = os.path.join(self.folder, path_info[len(self.urlpath):])
+    def find(self, path_info: str):
+        if self.files is not None:
+            return self.files.get(path_info)
 
-                return os.path.isfile(self.filepath)
+        if self.isdir and path_info.startswith(self.urlpath):
+            if os.path.isfile(filepath := os.path.join(self.folder, path_info[len(self.urlpath):])):
+                return filepath
 
     @property
     def file(self) -> WSGIGenerator:
         return File(self.filepath)
 
 
+def host_links(urlmap: Map) -> set[str]:
+    links = set()
+
+    for table in urlmap.host.values():
+        for target, _ in table.values():
+            links.update(target.values() if isinstance(target, dict) else (target,))
+
+    for mounted in urlmap.mount.values():
+        links |= host_links(mounted)
+
+    return links
+
+
+def invoke(call: Callable[..., Any], *args, **kwargs):
+    return call(*args, **kwargs)
+
+
+def layer(middleware: Callable[..., Any], inner: Callable[..., Any]):
+    def chain(call: Callable[..., Any], *args, **kwargs):
+        return middleware(functools.partial(inner, call), *args, **kwargs)
+
+    return chain
+
+
+def compose(middlewares: tuple[Callable[..., Any], ...]) -> Callable[..., Any]:
+    chain = invoke
+
+    for middleware in reversed(middlewares):
+        chain = layer(middleware, chain)
+
+    return chain
+
+
 def import_call(module: str, name: str, method: str | None) -> Callable[..., Any]:
     __import__(module)
 
@@ -160,10 +345,28 @@ def as_tuple(call: Any):
     return call if isinstance(call, tuple) else (call,)
 
 
-class Router(object):
-    __slots__ = ('pattern', 'callback', 'import_error', 'generator')
+def snapshot():
+    form: Form = getattr(request, '_form').get()
+
+    return (
+        {k: v for k, v in getattr(request, '_env').get().items() if isinstance(v, str)},
+        dict(getattr(request, '_query').get()),
+        dict(getattr(request, '_cookie').get()),
+        form.data,
+        form.files,
+        getattr(session, '_session').get(),
+    )
+
 
-    generator: WSGIGenerator
+def personal():
+    return (current := getattr(session, '_session').get()) is not None and current.data is not None
+
+
+class Router(object):
+    __slots__ = (
+        'dispatch', 'callback', 'cache', 'executor', 'pool', 'processes', 'sessions', 'handler', 'static_errors',
+        'errors', 'misses', 'limits', 'chains', 'hosts',
+    )
 
     def __init__(
             self,
@@ -171,54 +374,240 @@ class Router(object):
             import_error: tuple[str, str, str | None] | None,
             static_urlpath: str,
             template_folder: str,
+            pool: Pool = None,
+            processes: Processes = None,
+            sessions: Sessions = None,
+            fragments: Fragments = None,
+            template_reload: int | float | None = 1,
+            static_errors: bool = False,
+            misses: Misses = None,
+            middleware: tuple[Middleware, ...] = (),
     ):
-        self.pattern, self.callback = Pattern(urlmap), Callback(urlmap)
+        self.dispatch, self.callback, self.cache = Dispatch(urlmap), Callback(urlmap), dict(urlmap.cache)
+        self.hosts = host_links(urlmap)
+        self.executor, self.pool = dict(urlmap.executor), Pool() if pool is None else pool
+        self.processes, self.sessions = Processes() if processes is None else processes, sessions
 
-        if import_error is not None:
-            self.import_error = import_error
+        self.handler = None if import_error is None else import_call(*import_error)
+        self.static_errors, self.errors = static_errors or import_error is None, dict()
+        self.misses, self.limits = misses, dict(urlmap.limit)
 
-        for attr, value in (('_static', static_urlpath), ('_link', Link(urlmap))):
+        self.chains = {
+            link: compose(chain) for link in urlmap.callback.keys()
+            if (chain := tuple(m.call for m in middleware if m.applies(link)))
+        }
+
+        for attr, value in (('_static', static_urlpath), ('_link', link := Link(urlmap))):
             setattr(response, attr, value)
 
-        setattr(Template, 'templates', template_folder)
+        for attr, value in (
+                ('templates', template_folder),
+                ('cache', None),
+                ('programs', dict()),
+                ('fragments', Fragments() if fragments is None else fragments),
+                ('dependents', dict()),
+                ('stamps', dict()),
+                ('paths', dict()),
+                ('missing', set()),
+                ('reload', template_reload),
+                ('checked', 0.0),
+        ):
+            setattr(Template, attr, value)
+
+        Template.load()
+
+        setattr(session, '_sessions', sessions)
+
+        if any('process' == kind for kind, _ in self.executor.values()):
+            self.processes.start(template_folder, static_urlpath, link, sessions)
+
+    def preload(self):
+        self.dispatch.compile()
+
+        Template.preload()
+
+    def fork(self):
+        self.pool.fork()
+        self.processes.fork()
 
     def __call__(self, environ: WSGIEnvironment) -> WSGIGenerator:
         link, kwargs = self.request(environ)
 
         if link is None:
-            self.error(404)
+            return self.missing(environ, kwargs)
 
-        else:
-            self.router(link, kwargs)
+        if (throttled := self.throttle(environ, link)) is not None:
+            return throttled
+
+        if link in self.cache and environ.get('REQUEST_METHOD', 'GET') in ('GET', 'HEAD'):
+            return self.guard(link, kwargs, functools.partial(self.cached, environ, link))
 
-        return self.generator
+        return self.guard(link, kwargs, functools.partial(self.router, link))
 
     def request(self, environ: WSGIEnvironment):
+        self.context(environ)
+
+        return self.dispatch.parse(environ)
+
+    def context(self, environ: WSGIEnvironment):
         for attr, value in (
                 ('_env', environ),
                 ('_query', Query(environ)),
-                ('_cookie', Cookie(environ)),
+                ('_cookie', cookie := Cookie(environ)),
                 ('_form', Form(environ)),
         ):
-            setattr(request, attr, value)
+            getattr(request, attr).set(value)
+
+        getattr(response, '_header').set(Header())
+
+        getattr(session, '_session').set(None if self.sessions is None else Session(cookie.get(self.sessions.name)))
 
-        setattr(response, '_header', Header())
+    def missing(self, environ: WSGIEnvironment, kwargs: dict[str, Any]):
+        if 'allow' in kwargs.keys():
+            return self.error(405, [('allow', kwargs['allow'])])
 
-        return self.pattern.parse(environ)
+        if self.misses is not None:
+            self.misses.add(environ)
 
-    def error(self, code: int):
-        if hasattr(self, 'import_error'):
-            self.generator = Body(*as_tuple(import_call(*self.import_error)(code)))
+        return self.error(404)
+
+    def throttle(self, environ: WSGIEnvironment, link: str):
+        if (limit := self.limits.get(link)) is not None and (retry_after := limit.take(environ)):
+            return self.error(429, [('retry-after', str(retry_after))])
+
+    def reject(self, environ: WSGIEnvironment, code: int, headers: HeadersAlias = None):
+        if code in self.errors.keys():
+            getattr(request, '_env').set(environ)
 
         else:
-            message = {
-                404: 'Not Found',
-                500: 'Internal Server Error',
-            }
+            self.context(environ)
+
+        return self.error(code, headers)
+
+    def error(self, code: int, headers: HeadersAlias = None) -> Body | Cached:
+        if (entry := self.errors.get(code)) is not None:
+            return Cached(entry[0], [*entry[1], *headers] if headers else entry[1], entry[2])
+
+        body = self.render(code)
+
+        if self.static_errors and body.size is not None and not getattr(response, '_header').get().cookie:
+            self.errors[code] = body.entry
+
+        if headers:
+            body.headers.extend(headers)
+
+        return body
+
+    def render(self, code: int):
+        getattr(response, '_header').set(Header())
 
-            self.generator = Body(message[code], code, None, 'text/plain', 'ascii')
+        if self.handler is not None:
+            try:
+                return Body(*as_tuple(self.handler(code)))
 
-    def router(self, link: str, kwargs: dict[str, Any]):
+            except Exception:
+                traceback.print_exc(file=getattr(request, '_env').get().get('wsgi.errors', sys.stderr))
+
+                getattr(response, '_header').set(Header())
+
+        return Body(status(code)[4:], code, None, 'text/plain', 'ascii')
+
+    def failure(self):
+        traceback.print_exc(file=getattr(request, '_env').get().get('wsgi.errors', sys.stderr))
+
+        getattr(response, '_header').set(Header())
+
+        if (current := getattr(session, '_session').get()) is not None:
+            current.modified = False
+
+        return self.error(500)
+
+    def lookup(self, environ: WSGIEnvironment, link: str):
+        cache: Cache = self.cache[link]
+        key = cache.key(
+            link, environ, getattr(request, '_query').get(), getattr(request, '_cookie').get(), link in self.hosts
+        )
+
+        if (entry := cache.get(key)) is None:
+            return key, None
+
+        return key, Cached(*entry)
+
+    def store(self, link: str, key: str, body: Body | Cached):
+        if isinstance(body, Body) and 200 == body.code and body.size is not None:
+            if not getattr(response, '_header').get().cookie and not personal():
+                self.cache[link].set(key, body.entry)
+
+        return body
+
+    def cached(self, environ: WSGIEnvironment, link: str, *args, **kwargs):
+        key, cached = self.lookup(environ, link)
+
+        if cached is not None:
+            return cached
+
+        return self.store(link, key, self.response(self.router(link, *args, **kwargs)))
+
+    def endpoint(self, link: str):
         module, name, method, args = self.callback[link]
 
-        self.generator = Body(*as_tuple(import_call(module, name, method)(*args, **kwargs)))
+        return import_call(module, name, method), args
+
+    @staticmethod
+    def response(result: Any) -> Body | Cached:
+        return result if isinstance(result, Body | Cached) else Body(*as_tuple(result))
+
+    def unavailable(self, retry_after: int):
+        return self.error(503, [('retry-after', str(retry_after))])
+
+    def offload(self, link: str, args: tuple, kwargs: dict[str, Any]) -> tuple[Pool | Processes, Future | None]:
+        if 'process' == (executor := self.executor[link])[0]:
+            module, name, method, _ = self.callback[link]
+
+            return self.processes, self.processes.submit(
+                link, executor[1], (module, name, method, args), kwargs, snapshot()
+            )
+
+        return self.pool, self.pool.submit(self.endpoint(link)[0], *args, **kwargs)
+
+    def result(self, link: str, result: Any):
+        if 'process' == self.executor[link][0]:
+            result, simple, cookie, data = result
+
+            header: Header = getattr(response, '_header').get()
+            header.simple.update(simple)
+            header.cookie.update(cookie)
+
+            if data is not None and (current := getattr(session, '_session').get()) is not None:
+                current.data = data
+
+        return result
+
+    def guard(self, link: str, kwargs: dict[str, Any], call: Callable[..., Any]):
+        args = self.callback[link][3]
+
+        try:
+            if (chain := self.chains.get(link)) is None:
+                return self.response(call(*args, **kwargs))
+
+            return self.response(chain(call, *args, **kwargs))
+
+        except Exception:
+            return self.failure()
+
+    def router(self, link: str, *args, **kwargs):
+        if link in self.executor.keys():
+            executor, future = self.offload(link, args, kwargs)
+
+            if future is None:
+                return self.unavailable(executor.retry_after)
+
+            try:
+                return self.result(link, future.result(executor.timeout))
+
+            except TimeoutError:
+                executor.count('timeouts')
+
+                return self.unavailable(executor.retry_after)
+
+        return self.endpoint(link)[0](*args, **kwargs)
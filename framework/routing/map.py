@@ -40,17 +40,39 @@ class Link(dict[str, tuple[tuple[str, str, tuple[str, ...]], ...]]):
                         return f"{path}{args_query(args)}"
 
 
-class Pattern(dict[str, tuple[str, tuple[tuple[int, str], ...]]]):
-    def __init__(self, urlmap: Map):
+def allow(table: dict[str, str]):
+    methods = list(table.keys())
+
+    if 'GET' in table.keys() and 'HEAD' not in table.keys():
+        methods.append('HEAD')
+
+    return ', '.join(sorted(methods))
+
+
+class Pattern(dict[str, tuple[str | dict[str, str], tuple[tuple[int, str], ...]]]):
+    def __init__(self, urlmap: Map, host: str = None):
         dict.__init__(self)
-        dict.update(self, urlmap.pattern)
+        dict.update(self, urlmap.pattern if host is None else urlmap.host[host])
 
-    def parse(self, environ: WSGIEnvironment):
+    def parse(self, environ: WSGIEnvironment, path_info: str = None, prefix: tuple[str, ...] = ()):
         link, kwargs = None, dict()
 
+        if path_info is None:
+            path_info = environ['PATH_INFO']
+
         for pattern, items in self.items():
-            if values := re.findall(pattern, environ['PATH_INFO']):
-                (link, types), values = items, v if isinstance((v := values[0]), tuple) else (v,)
+            if r := re.match(pattern, path_info):
+                (link, types), values = items, (*prefix, *r.groups())
+
+                if isinstance(table := link, dict):
+                    if (method := environ.get('REQUEST_METHOD', 'GET')) in table.keys():
+                        link = table[method]
+
+                    elif 'HEAD' == method and 'GET' in table.keys():
+                        link = table['GET']
+
+                    else:
+                        return None, {'allow': allow(table)}
 
                 if 0 < values.__len__() == types.__len__():
                     tokens, i = dict(), 0
@@ -75,6 +97,77 @@ class Pattern(dict[str, tuple[str, tuple[tuple[int, str], ...]]]):
         return link, kwargs
 
 
+class Host(dict[str, Pattern]):
+    def __init__(self, urlmap: Map):
+        dict.__init__(self)
+
+        self.dynamic: tuple[tuple[str, Pattern], ...] = tuple()
+
+        for host in urlmap.host.keys():
+            if host.startswith('^'):
+                self.dynamic = (*self.dynamic, (host, Pattern(urlmap, host)))
+
+            else:
+                self[host] = Pattern(urlmap, host)
+
+    def parse(self, environ: WSGIEnvironment, path_info: str = None):
+        if not (name := environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')).endswith(']'):
+            name = name.rsplit(':', 1)[0]
+
+        if (name := name.lower()) in self.keys():
+            link, kwargs = self[name].parse(environ, path_info)
+
+            if link is not None or kwargs:
+                return link, kwargs
+
+        for host, pattern in self.dynamic:
+            if r := re.match(host, name):
+                link, kwargs = pattern.parse(environ, path_info, r.groups())
+
+                if link is not None or kwargs:
+                    return link, kwargs
+
+        return None, dict()
+
+
+class Dispatch(object):
+    __slots__ = ('pattern', 'host', 'mount')
+
+    def __init__(self, urlmap: Map):
+        self.pattern, self.host = Pattern(urlmap), Host(urlmap)
+        self.mount = {prefix: Dispatch(submap) for prefix, submap in urlmap.mount.items()}
+
+    def compile(self):
+        for pattern in (self.pattern, *self.host.values(), *(p for _, p in self.host.dynamic)):
+            for regex in pattern.keys():
+                re.compile(regex)
+
+        for host, _ in self.host.dynamic:
+            re.compile(host)
+
+        for dispatch in self.mount.values():
+            dispatch.compile()
+
+    def parse(self, environ: WSGIEnvironment, path_info: str = None):
+        if path_info is None:
+            path_info = environ['PATH_INFO']
+
+        if self.mount and (prefix := path_info.split('/', 2)[1:2]):
+            if (dispatch := self.mount.get(prefix := f"/{prefix[0]}")) is not None:
+                link, kwargs = dispatch.parse(environ, path_info[len(prefix):] or '/')
+
+                if link is not None or kwargs:
+                    return link, kwargs
+
+        if self.host or self.host.dynamic:
+            link, kwargs = self.host.parse(environ, path_info)
+
+            if link is not None or kwargs:
+                return link, kwargs
+
+        return self.pattern.parse(environ, path_info)
+
+
 class Callback(dict[str, tuple[str, str, str | None, tuple[Any, ...]]]):
     def __init__(self, urlmap: Map):
         dict.__init__(self)
@@ -0,0 +1,410 @@
+import io
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from importlib import import_module
+from typing import Any
+from urllib.parse import unquote_to_bytes
+
+from .alias import HeadersAlias, WSGIEnvironment
+from .asgi import Main as AsyncMain
+from .http.response.header import http_date
+from .main import Main
+
+line_limit, header_limit = 65536, 100
+
+
+class BadRequest(Exception):
+    pass
+
+
+def load(target: str) -> Main:
+    module, _, name = target.partition(':')
+
+    sys.path.insert(0, os.getcwd())
+
+    app = getattr(import_module(module), name or 'app')
+
+    if not isinstance(app, Main) or isinstance(app, AsyncMain):
+        raise TypeError("Server requires a WSGI Framework application: '%s'." % target)
+
+    return app
+
+
+def read_chunked(reader: io.BufferedReader):
+    body = bytearray()
+
+    while True:
+        size = int(reader.readline(line_limit).split(b';', 1)[0].strip(), 16)
+
+        if 0 == size:
+            while reader.readline(line_limit) not in (b'\r\n', b'\n', b''):
+                pass
+
+            return bytes(body)
+
+        body.extend(reader.read(size))
+        reader.readline(line_limit)
+
+
+def read_request(reader: io.BufferedReader, server: tuple[str, int], peer: Any) -> WSGIEnvironment | None:
+    if not (line := reader.readline(line_limit + 1)):
+        return None
+
+    if len(line) > line_limit:
+        raise BadRequest('Request line is too long.')
+
+    try:
+        method, target, protocol = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+
+    except ValueError:
+        raise BadRequest('Malformed request line.')
+
+    path, _, query = target.partition('?')
+
+    environ = {
+        'REQUEST_METHOD': method.upper(),
+        'SCRIPT_NAME': '',
+        'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+        'QUERY_STRING': query,
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': protocol,
+        'REMOTE_ADDR': peer[0] if isinstance(peer, tuple) else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+    for _ in range(header_limit):
+        if (line := reader.readline(line_limit + 1)) in (b'\r\n', b'\n', b''):
+            break
+
+        if len(line) > line_limit or b':' not in line:
+            raise BadRequest('Malformed header line.')
+
+        name, value = line.decode('latin-1').split(':', 1)
+        name, value = name.strip().upper().replace('-', '_'), value.strip()
+
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f"HTTP_{name}"
+
+        if name in environ.keys():
+            value = f"{environ[name]}{'; ' if 'HTTP_COOKIE' == name else ','}{value}"
+
+        environ[name] = value
+
+    else:
+        raise BadRequest('Too many headers.')
+
+    if 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower():
+        body = read_chunked(reader)
+
+    elif 0 < (length := int(environ.get('CONTENT_LENGTH') or 0)):
+        body = reader.read(length)
+
+    else:
+        body = b''
+
+    environ['wsgi.input'] = io.BytesIO(body)
+
+    return environ
+
+
+def head(status: str, headers: HeadersAlias, alive: bool):
+    return ''.join((
+        f"HTTP/1.1 {status}\r\n",
+        *(f"{k}: {v}\r\n" for k, v in headers),
+        f"date: {http_date()}\r\n",
+        f"connection: {'keep-alive' if alive else 'close'}\r\n\r\n",
+    )).encode('latin-1')
+
+
+def frame(chunk: bytes, chunked: bool):
+    if chunked and chunk:
+        return b'%x\r\n%s\r\n' % (len(chunk), chunk)
+
+    return chunk
+
+
+def keep_alive(environ: WSGIEnvironment):
+    connection = environ.get('HTTP_CONNECTION', '').lower()
+
+    if 'HTTP/1.1' == environ['SERVER_PROTOCOL']:
+        return 'close' not in connection
+
+    return 'keep-alive' in connection
+
+
+class Worker(object):
+    __slots__ = ('app', 'listener', 'address', 'max_requests', 'timeout', 'served', 'running')
+
+    def __init__(self, app: Main, listener: socket.socket, max_requests: int, timeout: int | float):
+        self.app, self.listener, self.address = app, listener, listener.getsockname()[:2]
+        self.max_requests, self.timeout, self.served, self.running = max_requests, timeout, 0, True
+
+    def stop(self, *_):
+        self.running = False
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        self.app.fork()
+        self.listener.settimeout(1)
+
+        while self.running:
+            try:
+                conn, peer = self.listener.accept()
+
+            except (socket.timeout, InterruptedError):
+                continue
+
+            except OSError:
+                break
+
+            with conn:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+                self.connection(conn, peer)
+
+            if 0 < self.max_requests <= self.served:
+                break
+
+    def connection(self, conn: socket.socket, peer: Any):
+        conn.settimeout(self.timeout)
+
+        reader = conn.makefile('rb')
+
+        try:
+            while True:
+                try:
+                    if (environ := read_request(reader, self.address, peer)) is None:
+                        break
+
+                except BadRequest as e:
+                    self.error(conn, '400 Bad Request', str(e).encode('ascii'))
+
+                    break
+
+                self.served += 1
+
+                if not self.respond(conn, environ) or not self.running or 0 < self.max_requests <= self.served:
+                    break
+
+        except (socket.timeout, ConnectionError, ValueError):
+            pass
+
+        finally:
+            reader.close()
+
+    def respond(self, conn: socket.socket, environ: WSGIEnvironment):
+        start: list[Any] = list()
+
+        def start_response(status: str, headers: HeadersAlias, exc_info: Any = None):
+            start[:] = status, headers
+
+            return conn.sendall
+
+        result, alive = None, keep_alive(environ)
+
+        try:
+            chunks = iter(result := self.app(environ, start_response))
+            first = next(chunks, b'')
+
+            status, headers = start
+
+            length = any('content-length' == k.lower() for k, _ in headers)
+            empty = 'HEAD' == environ['REQUEST_METHOD'] or status[:3] in ('204', '304') or status.startswith('1')
+            chunked = not length and not empty and 'HTTP/1.1' == environ['SERVER_PROTOCOL']
+
+            if chunked:
+                headers = [*headers, ('transfer-encoding', 'chunked')]
+
+            elif not length and not empty:
+                alive = False
+
+            conn.sendall(b''.join((head(status, headers, alive), frame(first, chunked))))
+
+            for chunk in chunks:
+                if chunk:
+                    conn.sendall(frame(chunk, chunked))
+
+            if chunked:
+                conn.sendall(b'0\r\n\r\n')
+
+        except (socket.timeout, ConnectionError):
+            return False
+
+        except Exception:
+            traceback.print_exc(file=environ['wsgi.errors'])
+
+            if not start:
+                self.error(conn, '500 Internal Server Error', b'Internal Server Error')
+
+            return False
+
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        return alive
+
+    @staticmethod
+    def error(conn: socket.socket, status: str, message: bytes):
+        conn.sendall(b''.join((
+            head(status, [('content-type', 'text/plain'), ('content-length', str(len(message)))], False), message
+        )))
+
+
+class Server(object):
+    __slots__ = (
+        'app', 'host', 'port', 'workers', 'reuse_port', 'max_requests', 'timeout', 'backlog',
+        'listener', 'children', 'generation', 'running', 'reloading',
+    )
+
+    def __init__(
+            self,
+            app: Main,
+            host: str = '127.0.0.1',
+            port: int = 8000,
+            workers: int = None,
+            reuse_port: bool = False,
+            max_requests: int = 0,
+            timeout: int | float = 5,
+            backlog: int = 1024,
+    ):
+        for attr, value in (
+                ('app', app),
+                ('host', host),
+                ('port', port),
+                ('workers', (os.cpu_count() or 1) if workers is None else workers),
+                ('reuse_port', reuse_port),
+                ('max_requests', max_requests),
+                ('timeout', timeout),
+                ('backlog', backlog),
+                ('listener', None),
+                ('children', dict()),
+                ('generation', 0),
+                ('running', True),
+                ('reloading', False),
+        ):
+            setattr(self, attr, value)
+
+    def bind(self):
+        listener = socket.socket(socket.AF_INET6 if ':' in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        if self.reuse_port:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        listener.bind((self.host, self.port))
+        listener.listen(self.backlog)
+
+        return listener
+
+    def spawn(self):
+        if 0 == (pid := os.fork()):
+            code = 0
+
+            try:
+                Worker(
+                    self.app, self.bind() if self.reuse_port else self.listener, self.max_requests, self.timeout
+                ).run()
+
+            except BaseException:
+                code = 1
+
+            finally:
+                os._exit(code)
+
+        self.children[pid] = self.generation
+
+    def reap(self):
+        while self.children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+
+            except ChildProcessError:
+                break
+
+            if 0 == pid:
+                break
+
+            if self.children.pop(pid, None) == self.generation and self.running:
+                self.spawn()
+
+    def reload(self):
+        self.reloading, self.generation = False, self.generation + 1
+
+        self.app.preload()
+
+        old = [pid for pid, generation in self.children.items() if generation != self.generation]
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        self.kill(old, signal.SIGTERM)
+
+    def kill(self, pids: list[int], signum: int):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+
+            except ProcessLookupError:
+                pass
+
+    def stop(self, *_):
+        self.running = False
+
+    def hangup(self, *_):
+        self.reloading = True
+
+    def serve(self, graceful_timeout: int | float = 10):
+        self.app.preload()
+        self.app.router.processes.shutdown()
+
+        if not self.reuse_port:
+            self.listener = self.bind()
+
+        elif not hasattr(socket, 'SO_REUSEPORT'):
+            raise OSError('SO_REUSEPORT is not supported on this platform.')
+
+        for signum, handler in (
+                (signal.SIGTERM, self.stop),
+                (signal.SIGINT, self.stop),
+                (signal.SIGHUP, self.hangup),
+        ):
+            signal.signal(signum, handler)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.running:
+            if self.reloading:
+                self.reload()
+
+            self.reap()
+
+            time.sleep(0.2)
+
+        self.kill(list(self.children.keys()), signal.SIGTERM)
+
+        deadline = time.monotonic() + graceful_timeout
+
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+
+            time.sleep(0.1)
+
+        self.kill(list(self.children.keys()), signal.SIGKILL)
+
+        if self.listener is not None:
+            self.listener.close()
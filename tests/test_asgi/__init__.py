@@ -0,0 +1,164 @@
+import asyncio
+import time
+import unittest
+
+from framework.asgi import Main
+from framework.cache import Cache
+from framework.http.request import Path, query, cookie, form
+from framework.http.response import set_header
+from framework.routing import Rule, Endpoint, Map, Middleware
+
+
+async def dummy_async(path: Path):
+    set_header('name', path['name'])
+
+    await asyncio.sleep(0.05)
+
+    return f"{path['name']} {query('query')}"
+
+
+def dummy_sync():
+    set_header('thread', 'sync')
+
+    return f"form {form('form')}"
+
+
+def dummy_wrap(call_next, *args, **kwargs):
+    return f"wrapped {call_next(*args, **kwargs)}"
+
+
+def dummy_gate(call_next, *args, **kwargs):
+    if 'open' != cookie('gate'):
+        return 'Forbidden', 403
+
+    return call_next(*args, **kwargs)
+
+
+class Client(object):
+    __slots__ = ('app', 'messages')
+
+    def __init__(self, app: Main):
+        self.app = app
+
+    async def request(self, method: str, path: str, query_string: bytes = b'', headers=(), body=(b'',)):
+        scope = {
+            'type': 'http',
+            'method': method,
+            'path': path,
+            'query_string': query_string,
+            'headers': list(headers),
+        }
+        chunks, messages = list(body), list()
+
+        async def receive():
+            return {'type': 'http.request', 'body': chunks.pop(0), 'more_body': 0 < len(chunks)}
+
+        async def send(message):
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+
+        start = messages.pop(0)
+
+        return start['status'], dict(start['headers']), b''.join(m['body'] for m in messages)
+
+
+class TestModule(unittest.TestCase):
+    def test_http(self):
+        client = Client(Main(__name__, Map((
+            Rule('/async/<name>', 'async'),
+            Endpoint('async', dummy_async),
+            Rule('/sync', 'sync'),
+            Endpoint('sync', dummy_sync),
+        )), static_folder='../test_main/folder/path/to'))
+
+        async def main():
+            return await asyncio.gather(
+                client.request('GET', '/async/one', b'query=1'),
+                client.request('GET', '/async/two', b'query=2'),
+            )
+
+        start_time = time.monotonic()
+
+        one, two = asyncio.run(main())
+
+        self.assertLess(time.monotonic() - start_time, 0.09)
+        self.assertTupleEqual((200, b'one', b'one 1'), (one[0], one[1][b'name'], one[2]))
+        self.assertTupleEqual((200, b'two', b'two 2'), (two[0], two[1][b'name'], two[2]))
+
+        status, headers, body = asyncio.run(client.request(
+            'POST', '/sync',
+            headers=[(b'content-type', b'application/x-www-form-urlencoded')],
+            body=(b'form=o', b'ne&append=two'),
+        ))
+
+        self.assertTupleEqual((200, b'sync', b'form one'), (status, headers[b'thread'], body))
+
+        status, headers, body = asyncio.run(client.request('GET', '/static/test.txt'))
+
+        self.assertTupleEqual((200, b'simple text'), (status, body))
+        self.assertEqual(b'text/plain; charset=utf-8', headers[b'content-type'])
+
+        status, headers, body = asyncio.run(client.request('HEAD', '/static/test.txt'))
+
+        self.assertTupleEqual((200, b'11', b''), (status, headers[b'content-length'], body))
+
+        status, headers, body = asyncio.run(client.request('GET', '/missing'))
+
+        self.assertTupleEqual((404, b'Not Found'), (status, body))
+
+    def test_middleware(self):
+        client = Client(Main(__name__, Map((
+            Rule('/async/<name>', 'async'),
+            Endpoint('async', dummy_async),
+            Rule('/sync', 'sync'),
+            Endpoint('sync', dummy_sync),
+            Rule('/cached/<name>', 'cached'),
+            Endpoint('cached', dummy_async, cache=Cache(60)),
+        )), middleware=(Middleware(dummy_wrap, exclude='cached'), Middleware(dummy_gate, 'cached'))))
+
+        status, headers, body = asyncio.run(client.request('GET', '/async/one', b'query=1'))
+
+        self.assertTupleEqual((200, b'one', b'wrapped one 1'), (status, headers[b'name'], body))
+
+        status, headers, body = asyncio.run(client.request('GET', '/sync'))
+
+        self.assertTupleEqual((200, b'sync', b'wrapped form None'), (status, headers[b'thread'], body))
+
+        for gate, expected in (
+                (b'gate=open', (200, b'one 1')),
+                (b'gate=closed', (403, b'Forbidden')),
+                (b'gate=open', (200, b'one 1')),
+        ):
+            status, headers, body = asyncio.run(client.request('GET', '/cached/one', b'query=1', ((b'cookie', gate),)))
+
+            self.assertTupleEqual(expected, (status, body))
+
+        self.assertEqual(1, len(client.app.router.cache['cached'].backend.store))
+
+    def test_lifespan(self):
+        app, messages = Main(__name__, Map(())), list()
+        events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+
+        async def receive():
+            return events.pop(0)
+
+        async def send(message):
+            messages.append(message['type'])
+
+        asyncio.run(app({'type': 'lifespan'}, receive, send))
+
+        self.assertListEqual(['lifespan.startup.complete', 'lifespan.shutdown.complete'], messages)
+
+
+def asgi_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_http',
+            'test_middleware',
+            'test_lifespan',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -0,0 +1,168 @@
+import os
+import shutil
+import time
+import unittest
+
+from framework.cache import Cache, Memory, Filesystem
+from framework.http.request import Path
+from framework.http.response import set_cookie
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map
+
+from .. import dummy_environ, DummyStartResponse
+
+environ, start_response = dummy_environ.copy(), DummyStartResponse()
+
+calls = {'count': 0, 'cookie': 0}
+
+
+def dummy_count():
+    calls['count'] += 1
+
+    return f"count {calls['count']}"
+
+
+def dummy_cookie():
+    calls['cookie'] += 1
+
+    set_cookie('session', 'value')
+
+    return f"cookie {calls['cookie']}"
+
+
+def dummy_host(path: Path):
+    return f"host {path['sub']}"
+
+
+class TestModule(unittest.TestCase):
+    def test_memory(self):
+        memory = Memory(entries=2, size=10)
+
+        memory.set('one', ('200 OK', [], b'one'), 60)
+        memory.set('two', ('200 OK', [], b'two'), 60)
+
+        self.assertEqual(b'one', memory.get('one')[2])
+
+        memory.set('three', ('200 OK', [], b'three'), 60)
+
+        self.assertIsNone(memory.get('two'))
+        self.assertEqual((2, 8), (len(memory.store), memory.bytes))
+
+        memory.set('four', ('200 OK', [], b'four'), 60)
+
+        self.assertIsNone(memory.get('one'))
+        self.assertEqual(b'four', memory.get('four')[2])
+
+        memory.set('large', ('200 OK', [], b'x' * 11), 60)
+
+        self.assertIsNone(memory.get('large'))
+
+        memory.set('expired', ('200 OK', [], b''), 0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(memory.get('expired'))
+
+        memory.clear()
+
+        self.assertEqual((0, 0), (len(memory.store), memory.bytes))
+
+    def test_filesystem(self):
+        folder = os.path.join(os.path.dirname(__file__), 'cache')
+
+        filesystem = Filesystem(folder)
+
+        try:
+            filesystem.set('key', ('200 OK', [('content-length', '4')], b'body'), 60)
+
+            self.assertTupleEqual(('200 OK', [('content-length', '4')], b'body'), filesystem.get('key'))
+            self.assertIsNone(Filesystem(folder).get('other'))
+
+            filesystem.delete('key')
+
+            self.assertIsNone(filesystem.get('key'))
+
+            filesystem.set('expired', ('200 OK', [], b''), -1)
+
+            self.assertIsNone(filesystem.get('expired'))
+            self.assertListEqual([], os.listdir(folder))
+
+        finally:
+            shutil.rmtree(folder)
+
+    def test_endpoint(self):
+        app = Main(__name__, Map((
+            Rule('/count', 'count'),
+            Endpoint('count', dummy_count, cache=Cache(60, query=('page',))),
+            Rule('/cookie', 'cookie'),
+            Endpoint('cookie', dummy_cookie, cache=Cache(60)),
+        )), etag=True)
+
+        environ['PATH_INFO'], environ['QUERY_STRING'] = '/count', 'page=1&other=1'
+
+        self.assertEqual(b'count 1', b''.join(app(environ, start_response)))
+
+        environ['QUERY_STRING'] = 'page=1&other=2'
+
+        self.assertEqual(b'count 1', b''.join(app(environ, start_response)))
+        self.assertEqual('200 OK', start_response.status)
+        self.assertIn(('content-length', '7'), start_response.headers)
+
+        environ['HTTP_IF_NONE_MATCH'] = dict(start_response.headers)['etag']
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('304 Not Modified', start_response.status)
+
+        del environ['HTTP_IF_NONE_MATCH']
+
+        environ['QUERY_STRING'] = 'page=2'
+
+        self.assertEqual(b'count 2', b''.join(app(environ, start_response)))
+
+        environ['REQUEST_METHOD'] = 'POST'
+
+        self.assertEqual(b'count 3', b''.join(app(environ, start_response)))
+
+        environ['REQUEST_METHOD'], environ['PATH_INFO'], environ['QUERY_STRING'] = 'GET', '/cookie', ''
+
+        self.assertEqual(b'cookie 1', b''.join(app(environ, start_response)))
+        self.assertEqual(b'cookie 2', b''.join(app(environ, start_response)))
+
+        with self.assertRaises(ValueError) as context:
+            Cache(0)
+
+        self.assertEqual('Response cache. TTL must be a positive number: 0.', context.exception.args[0])
+
+    def test_host(self):
+        app = Main(__name__, Map((
+            Rule('/', 'index', host='<sub>.example.com'),
+            Endpoint('index', dummy_host, cache=Cache(60)),
+        )))
+
+        environ['PATH_INFO'] = '/'
+
+        for host, body in (
+                ('a.example.com', b'host a'),
+                ('b.example.com', b'host b'),
+                ('A.example.com', b'host a'),
+        ):
+            environ['HTTP_HOST'] = host
+
+            self.assertEqual(body, b''.join(app(environ, start_response)))
+
+        self.assertEqual({'index'}, app.router.hosts)
+
+        del environ['HTTP_HOST']
+
+
+def cache_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_memory',
+            'test_filesystem',
+            'test_endpoint',
+            'test_host',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
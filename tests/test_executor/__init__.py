@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import unittest
+
+from framework.executor import Pool, Processes
+from framework.http.request import query, cookie, Path
+from framework.http.response import set_header
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map
+
+from .. import dummy_environ, DummyStartResponse
+
+environ, start_response = dummy_environ.copy(), DummyStartResponse()
+
+started, release = threading.Event(), threading.Event()
+
+
+def dummy_blocking():
+    set_header('thread', threading.current_thread().name.split('_')[0])
+
+    if 'wait' == query('mode'):
+        started.set()
+        release.wait(1)
+
+    elif 'sleep' == query('mode'):
+        time.sleep(0.2)
+
+    return 'blocking'
+
+
+def dummy_process(prefix: str, path: Path):
+    set_header('pid', str(os.getpid()))
+
+    if 'sleep' == query('mode'):
+        time.sleep(0.3)
+
+    return f"{prefix} {path['name']} {cookie('cookie')}", 200, [('x-process', 'yes')], 'text/plain'
+
+
+class TestModule(unittest.TestCase):
+    def test_pool(self):
+        pool = Pool(workers=2, queue=0)
+
+        self.assertEqual(3, pool.submit(sum, (1, 2)).result())
+
+        with self.assertRaises(ZeroDivisionError):
+            pool.submit(divmod, 1, 0).result()
+
+        pool.shutdown()
+
+        self.assertDictEqual({
+            'submitted': 2, 'pending': 0, 'active': 0, 'completed': 1,
+            'failed': 1, 'rejected': 0, 'timeouts': 0, 'queued': 0,
+        }, pool.stats())
+
+        with self.assertRaises(ValueError) as context:
+            Pool(workers=0)
+
+        self.assertEqual(
+            'Thread pool. Workers must be positive and queue must not be negative.',
+            context.exception.args[0],
+        )
+
+    def test_blocking(self):
+        app = Main(__name__, Map((
+            Rule('/', 'blocking'),
+            Endpoint('blocking', dummy_blocking, blocking=True),
+        )), pool=(pool := Pool(workers=1, queue=0, timeout=0.05, retry_after=5)))
+
+        environ['PATH_INFO'] = '/'
+
+        self.assertEqual(b'blocking', b''.join(app(environ, start_response)))
+        self.assertEqual('framework-pool', dict(start_response.headers)['thread'])
+
+        background = threading.Thread(target=lambda: list(app(
+            dict(environ, QUERY_STRING='mode=wait'), DummyStartResponse()
+        )))
+        background.start()
+        started.wait(1)
+
+        self.assertEqual(b'Service Unavailable', b''.join(app(environ, start_response)))
+        self.assertEqual('503 Service Unavailable', start_response.status)
+        self.assertEqual('5', dict(start_response.headers)['retry-after'])
+
+        release.set()
+        background.join()
+
+        environ['QUERY_STRING'] = 'mode=sleep'
+
+        self.assertEqual(b'Service Unavailable', b''.join(app(environ, start_response)))
+
+        environ['QUERY_STRING'] = ''
+
+        pool.shutdown()
+
+        self.assertTupleEqual((1, 1), (pool.stats()['rejected'], pool.stats()['timeouts']))
+
+    def test_process(self):
+        app = Main(__name__, Map((
+            Rule('/<name>', 'process'),
+            Endpoint('process', dummy_process, 'process', process=True, concurrency=1),
+        )), processes=(processes := Processes(workers=2, timeout=5)))
+
+        self.assertIsNotNone(processes.executor)
+
+        processes.shutdown()
+        app.fork()
+
+        self.assertIsNotNone(processes.executor)
+
+        try:
+            environ['PATH_INFO'], environ['HTTP_COOKIE'] = '/name', 'cookie=value'
+
+            self.assertEqual(b'process name value', b''.join(app(environ, start_response)))
+            self.assertEqual('200 OK', start_response.status)
+
+            headers = dict(start_response.headers)
+
+            self.assertEqual('yes', headers['x-process'])
+            self.assertNotEqual(str(os.getpid()), headers['pid'])
+
+            background = threading.Thread(target=lambda: list(app(
+                dict(environ, QUERY_STRING='mode=sleep'), DummyStartResponse()
+            )))
+            background.start()
+
+            while 2 > processes.stats()['submitted']:
+                time.sleep(0.01)
+
+            self.assertEqual(b'Service Unavailable', b''.join(app(environ, start_response)))
+
+            background.join()
+
+            self.assertDictEqual({
+                'submitted': 2, 'pending': 0, 'completed': 2, 'failed': 0, 'rejected': 1, 'timeouts': 0,
+            }, processes.stats())
+
+        finally:
+            del environ['HTTP_COOKIE']
+
+            processes.shutdown()
+
+        with self.assertRaises(ValueError) as context:
+            Endpoint('link', dummy_process, blocking=True, process=True)
+
+        self.assertEqual(
+            "URL Map. Endpoint. Endpoint cannot be both blocking and process: 'link'.",
+            context.exception.args[0],
+        )
+
+
+def executor_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_pool',
+            'test_blocking',
+            'test_process',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -5,6 +5,7 @@ from framework.http import Query, Cookie, Form
 
 from .test_request import request_tests
 from .test_response import response_tests
+from .test_session import session_tests
 
 
 class TestModule(unittest.TestCase):
@@ -54,5 +55,6 @@ def http_tests():
 
     suite.addTests(request_tests())
     suite.addTests(response_tests())
+    suite.addTests(session_tests())
 
     return suite
@@ -1,3 +1,8 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime, timezone
 
@@ -6,8 +11,17 @@ from framework.http.response import (
     url_file, url_for,
     set_header, get_header, has_header, delete_header,
     set_cookie, delete_cookie,
+    fresh, not_modified_page,
     redirect_page,
-    render_template
+    json_page,
+    event_stream, Event,
+    render_template, stream_template
+)
+from framework.http.response.header import cookie_header, http_date
+from framework.http.response.template import (
+    artifact_path, compile_templates, load_templates,
+    compile_body, compile_parts, program_replace, escape, escape_cached,
+    Fragments, Frame, Markup, Template,
 )
 from framework.main import Main
 from framework.routing import Rule, Endpoint, Map
@@ -16,6 +30,8 @@ from .. import dummy_environ, dummy, DummyStartResponse
 
 environ, start_response = dummy_environ.copy(), DummyStartResponse()
 
+calls = list()
+
 
 def dummy_section():
     return 'section'
@@ -47,6 +63,66 @@ def dummy_redirect(path: Path):
     return redirect_page(*args)
 
 
+def dummy_json(path: Path):
+    match path['kind']:
+        case 'dict':
+            return {'key': 'value', 'list': [1, 2.5, None, True], 'text': 'é'}
+
+        case 'list':
+            return [1, 2, 3], 201
+
+        case 'stream':
+            return json_page({'id': i} for i in range(3))
+
+        case 'empty':
+            return json_page(iter(()))
+
+    return (f"{i}\n" for i in range(3))
+
+
+closed, release = threading.Event(), threading.Event()
+
+
+def dummy_events(path: Path):
+    def events():
+        try:
+            yield 'one\ntwo'
+            yield Event({'count': 1}, event='update', id='1', retry=1000)
+
+            if 'slow' == path['mode']:
+                time.sleep(0.3)
+
+            yield Event(event='ping')
+
+            while 'endless' == path['mode']:
+                yield 'more'
+
+            if 'quiet' == path['mode']:
+                release.wait(5)
+
+                yield 'late'
+
+        finally:
+            closed.set()
+
+    return event_stream(events(), None if 'direct' == path['mode'] else 0.1)
+
+
+def dummy_loop():
+    return stream_template('loop.html', {
+        'items': ({'name': f"user {i}", 'active': True} for i in range(1000)),
+    })
+
+
+def dummy_fresh(path: Path):
+    calls.append(path['version'])
+
+    if fresh(etag=path['version'], last_modified=0):
+        return not_modified_page()
+
+    return f"version {path['version']}"
+
+
 def dummy_template(year, path: Path):
     context = {
         'title': f"{(filename := path['filename']).split('.')[0].title()} page",
@@ -146,6 +222,433 @@ class TestModule(unittest.TestCase):
 
         self.assertEqual(url_for('header'), value)
 
+    def test_cookie(self):
+        self.assertEqual('Thu, 01 Jan 1970 00:00:00 GMT', http_date(0))
+        self.assertEqual('Sun, 06 Nov 1994 08:49:37 GMT', http_date(784111777.9))
+        self.assertIs(http_date(784111777), http_date(784111777.5))
+        self.assertEqual(
+            'Sun, 06 Nov 1994 08:49:37 GMT', http_date(datetime(1994, 11, 6, 8, 49, 37, tzinfo=timezone.utc).timestamp())
+        )
+
+        self.assertEqual('one=1; Path=/', cookie_header('one', '1'))
+        self.assertEqual(
+            'one=1; expires=Sun, 06 Nov 1994 08:49:37 GMT; Max-Age=60; Path=/app; Domain=example.com; '
+            'Secure; HttpOnly; SameSite=Lax',
+            cookie_header('one', '1', 784111777, 60, '/app', 'example.com', True, True, 'lax'),
+        )
+        self.assertEqual(
+            'one=1; expires=Sun, 06 Nov 1994 08:49:37 GMT',
+            cookie_header('one', '1', 'Sun, 06 Nov 1994 08:49:37 GMT', path=None),
+        )
+        self.assertTrue(cookie_header('one', '1', max_age=60).startswith('one=1; expires='))
+
+        for kwargs, message in (
+                ({'path': ''}, 'The path value of a cookie cannot be the empty string.'),
+                ({'samesite': 'other'}, "The samesite='other' cookie value must be 'none', 'lax' or 'strict'."),
+                ({'expires': 'yesterday'}, 'Datetime string format does not match for cookie.'),
+                ({'expires': datetime(1994, 11, 6)}, 'Cookie requires UTC datetime.'),
+        ):
+            with self.assertRaises(ValueError) as context:
+                cookie_header('one', '1', **kwargs)
+
+            self.assertEqual(message, context.exception.args[0])
+
+    def test_etag(self):
+        app = Main(__name__, Map((
+            Rule('/section', 'section'),
+            Endpoint('section', dummy_section),
+            Rule('/fresh/<version>', 'fresh'),
+            Endpoint('fresh', dummy_fresh),
+        )), etag=True)
+
+        environ['PATH_INFO'] = '/section'
+
+        self.assertEqual(b'section', b''.join(app(environ, start_response)))
+
+        etag = dict(start_response.headers)['etag']
+
+        self.assertTrue(etag.startswith('W/"'))
+
+        environ['HTTP_IF_NONE_MATCH'] = etag
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('304 Not Modified', start_response.status)
+        self.assertNotIn('content-length', dict(start_response.headers))
+
+        environ['HTTP_IF_NONE_MATCH'] = '"other", ' + etag.removeprefix('W/')
+
+        b''.join(app(environ, start_response))
+
+        self.assertEqual('304 Not Modified', start_response.status)
+
+        environ['HTTP_IF_NONE_MATCH'], environ['PATH_INFO'] = 'W/"one"', '/fresh/one'
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('304 Not Modified', start_response.status)
+        self.assertEqual('Thu, 01 Jan 1970 00:00:00 GMT', dict(start_response.headers)['last-modified'])
+
+        environ['PATH_INFO'] = '/fresh/two'
+
+        self.assertEqual(b'version two', b''.join(app(environ, start_response)))
+        self.assertEqual('200 OK', start_response.status)
+        self.assertEqual('W/"two"', dict(start_response.headers)['etag'])
+        self.assertListEqual(['one', 'two'], calls)
+
+        del environ['HTTP_IF_NONE_MATCH']
+
+        environ['HTTP_IF_MODIFIED_SINCE'] = 'Thu, 01 Jan 1970 00:00:00 GMT'
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('304 Not Modified', start_response.status)
+
+        del environ['HTTP_IF_MODIFIED_SINCE']
+
+    def test_json(self):
+        app = Main(__name__, Map((
+            Rule('/json/<kind>', 'json'),
+            Endpoint('json', dummy_json),
+        )), json_encoder='json')
+
+        environ['PATH_INFO'] = '/json/dict'
+
+        self.assertEqual(
+            '{"key":"value","list":[1,2.5,null,true],"text":"é"}'.encode('utf-8'),
+            b''.join(app(environ, start_response)),
+        )
+        self.assertEqual('application/json', dict(start_response.headers)['content-type'])
+        self.assertEqual('52', dict(start_response.headers)['content-length'])
+
+        environ['PATH_INFO'] = '/json/list'
+
+        self.assertEqual(b'[1,2,3]', b''.join(app(environ, start_response)))
+        self.assertEqual('201 Created', start_response.status)
+
+        environ['PATH_INFO'] = '/json/stream'
+
+        self.assertEqual(b'[{"id":0},{"id":1},{"id":2}]', b''.join(app(environ, start_response)))
+        self.assertEqual('application/json', dict(start_response.headers)['content-type'])
+        self.assertNotIn('content-length', dict(start_response.headers))
+
+        environ['PATH_INFO'] = '/json/empty'
+
+        self.assertEqual(b'[]', b''.join(app(environ, start_response)))
+
+        environ['PATH_INFO'] = '/json/text'
+
+        self.assertEqual(b'0\n1\n2\n', b''.join(app(environ, start_response)))
+        self.assertEqual('text/plain; charset=utf-8', dict(start_response.headers)['content-type'])
+
+        app = Main(__name__, Map((
+            Rule('/json/<kind>', 'json'),
+            Endpoint('json', dummy_json),
+        )), json_encoder=lambda obj: b'custom')
+
+        environ['PATH_INFO'] = '/json/dict'
+
+        self.assertEqual(b'custom', b''.join(app(environ, start_response)))
+
+        with self.assertRaises(ValueError) as context:
+            Main(__name__, Map(()), json_encoder='unknown')
+
+        self.assertEqual("JSON encoder. Unknown backend: 'unknown'.", context.exception.args[0])
+
+        Main(__name__, Map(()))
+
+    def test_event(self):
+        app = Main(__name__, Map((
+            Rule('/events/<mode>', 'events'),
+            Endpoint('events', dummy_events),
+        )), json_encoder='json')
+
+        expected = [
+            b'data: one\ndata: two\n\n',
+            b'event: update\nid: 1\nretry: 1000\ndata: {"count":1}\n\n',
+            b'event: ping\n\n',
+        ]
+
+        environ['PATH_INFO'] = '/events/direct'
+
+        self.assertEqual(expected, list(app(environ, start_response)))
+        self.assertEqual('text/event-stream; charset=utf-8', dict(start_response.headers)['content-type'])
+        self.assertEqual('no-cache', dict(start_response.headers)['cache-control'])
+        self.assertNotIn('content-length', dict(start_response.headers))
+
+        environ['PATH_INFO'] = '/events/slow'
+
+        chunks = list(app(environ, start_response))
+
+        self.assertIn(b':\n\n', chunks)
+        self.assertEqual(expected, [c for c in chunks if b':\n\n' != c])
+
+        closed.clear()
+        environ['PATH_INFO'] = '/events/endless'
+
+        result = app(environ, start_response)
+        iterator = iter(result)
+
+        self.assertEqual(expected[0], next(iterator))
+
+        result.close()
+
+        self.assertTrue(closed.wait(2))
+
+        closed.clear()
+        environ['PATH_INFO'] = '/events/quiet'
+
+        iterator = iter(result := app(environ, start_response))
+
+        chunks = list()
+
+        while 3 > len(chunks):
+            if b':\n\n' != (chunk := next(iterator)):
+                chunks.append(chunk)
+
+        self.assertEqual(expected, chunks)
+
+        result.close()
+
+        self.assertFalse(closed.wait(0.2))
+
+        release.set()
+
+        self.assertTrue(closed.wait(2))
+
+        for kwargs in ({'event': 'a\ndata: b'}, {'id': '1\r'}, {'id': '1\0'}):
+            with self.assertRaises(ValueError) as context:
+                Event(**kwargs)
+
+            self.assertIn('Event. Field must not contain line breaks or NUL', context.exception.args[0])
+
+    def test_fragment(self):
+        app = Main(__name__, Map(()))
+
+        def render(user: str, counter: str):
+            return Template('fragment.html').render({'user': user, 'counter': counter})
+
+        self.assertIn('<p>a 1</p>\n    <p>1</p>', render('a', '1'))
+        self.assertIn('<div id="footer">\n    1\n</div>', render('a', '1'))
+
+        self.assertIn('<p>a 1</p>\n    <p>2</p>', body := render('a', '2'))
+        self.assertIn('<div id="footer">\n    1\n</div>', body)
+
+        self.assertIn('<p>b 3</p>\n    <p>3</p>', render('b', '3'))
+
+        time.sleep(0.25)
+
+        self.assertIn('<div id="footer">\n    4\n</div>', body := render('a', '4'))
+        self.assertIn('<p>a 1</p>', body)
+        self.assertNotIn('{% cache', body)
+
+        app.preload()
+
+        self.assertIn(Template.cache['fragment.html'], Template.programs.keys())
+        self.assertIn('<p>a 1</p>', render('a', '5'))
+
+        Template.fragments.clear()
+
+        self.assertIn('<p>a 6</p>', render('a', '6'))
+
+        Template.cache = None
+
+        program, fragments = compile_body(
+            '{% if header %}{% cache header %}H{{ n }}{% endcache %}{% endif %}'
+            '{% for item in items %}{% cache row item.id %}[{{ item.id }} {{ n }}]{% endcache %}{% endfor %}'
+        ), Fragments()
+
+        self.assertEqual('H1[1 1][2 1]', program_replace({
+            'header': True, 'items': [{'id': 1}, {'id': 2}], 'n': 1,
+        }, program, fragments))
+        self.assertEqual('H1[1 1][3 2]', program_replace({
+            'header': True, 'items': [{'id': 1}, {'id': 3}], 'n': 2,
+        }, program, fragments))
+        self.assertEqual('[2 1]', program_replace({'items': [{'id': 2}], 'n': 3}, program, fragments))
+
+        program = compile_body('{% cache menu user %}{{ user.name }} {{ n }}{% endcache %}')
+
+        for user, n, expected in (({'name': 'a'}, 1, 'a 1'), ({'name': 'a'}, 2, 'a 1'), ({'name': 'b'}, 3, 'b 3')):
+            self.assertEqual(expected, program_replace({'user': user, 'n': n}, program, fragments))
+
+        for body, message in (
+                ('{% cache %}{% endcache %}', "Template. Invalid cache: ''."),
+                ('{% endcache %}', 'Template. Unexpected {% endcache %}.'),
+                ('{% for x in y %}{% cache a %}{% endfor %}{% endcache %}', 'Template. Unexpected {% endfor %}.'),
+                ('{% cache a %}{% else %}{% endcache %}', 'Template. Unexpected {% else %}.'),
+                ('{% cache a %}', 'Template. Unclosed {% cache %}.'),
+        ):
+            with self.assertRaises(ValueError) as context:
+                compile_parts(body)
+
+            self.assertEqual(message, context.exception.args[0])
+
+    def test_escape(self):
+        Main(__name__, Map(()))
+
+        self.assertEqual(
+            '<p title="&quot;quoted&quot;">&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;</p><i>safe</i>1{{ missing }}\n'
+            '<link href="/static/style.css">{{ unknown(\'x\') }}',
+            Template('escape.html').render({
+                'title': '"quoted"', 'text': '<b>Tom & Jerry</b>', 'safe': Markup('<i>safe</i>'), 'number': 1,
+            }),
+        )
+        self.assertIsInstance(escape('<'), Markup)
+        self.assertIs(markup := Markup('<'), escape(markup))
+        self.assertIs(escape_cached('/a&b'), escape_cached('/a&b'))
+
+    def test_control(self):
+        app = Main(__name__, Map((
+            Rule('/loop', 'loop'),
+            Endpoint('loop', dummy_loop),
+        )))
+
+        users = [
+            {'name': '<a>', 'admin': True, 'active': True},
+            {'name': 'b', 'admin': False, 'active': False},
+            {'name': 'c', 'admin': False, 'active': True},
+        ]
+
+        self.assertEqual(
+            '<ul>\n'
+            '<li>&lt;a&gt; (admin)</li>\n'
+            '<li>b (inactive)</li>\n'
+            '<li>c (user)</li>\n'
+            '</ul>\n'
+            '<h1>Users</h1>',
+            Template('loop.html').render({'items': users, 'title': 'Users'}),
+        )
+        self.assertEqual('<ul>\n<li>Nobody</li>\n</ul>', Template('loop.html').render({'items': []}))
+        self.assertEqual('<ul>\n<li>Nobody</li>\n</ul>', Template('loop.html').render(None))
+
+        environ['PATH_INFO'] = '/loop'
+
+        chunks = list(app(environ, start_response))
+
+        self.assertLess(1, len(chunks))
+        self.assertTrue(b''.join(chunks).startswith(b'<ul>\n<li>user 0 (user)</li>\n<li>user 1 (user)</li>'))
+        self.assertTrue(b''.join(chunks).endswith(b'<li>user 999 (user)</li>\n</ul>'))
+        self.assertEqual('text/html; charset=utf-8', dict(start_response.headers)['content-type'])
+
+        for body, message in (
+                ('{% for x %}{% endfor %}', "Template. Invalid loop: 'x'."),
+                ('{% if a b %}{% endif %}', "Template. Invalid condition: 'a b'."),
+                ('{% endif %}', 'Template. Unexpected {% endif %}.'),
+                ('{% for x in y %}{% endif %}', 'Template. Unexpected {% endif %}.'),
+                ('{% if x %}{% else %}{% elif y %}{% endif %}', 'Template. Unexpected {% elif %}.'),
+                ('{% for x in y %}{% else %}{% else %}{% endfor %}', 'Template. Unexpected {% else %}.'),
+                ('{% if x %}', 'Template. Unclosed {% if %}.'),
+        ):
+            with self.assertRaises(ValueError) as context:
+                compile_parts(body)
+
+            self.assertEqual(message, context.exception.args[0])
+
+    def test_compile(self):
+        templates = os.path.join(os.path.dirname(__file__), 'templates')
+
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(templates, folder := os.path.join(folder, 'templates'))
+
+            entries = compile_templates(folder)
+
+            self.assertTrue(os.path.isfile(artifact_path(folder)))
+            self.assertIn('super.html', entries.keys())
+            self.assertEqual(
+                ['super.html', 'template/base.html', 'template/index.html'],
+                [name for name, *_ in entries['super.html'][2]],
+            )
+
+            loaded = load_templates(folder)
+
+            self.assertEqual(set(entries.keys()), set(loaded.keys()))
+            self.assertEqual(Frame(folder).get_body('super.html'), loaded['super.html'][0])
+
+            os.utime(os.path.join(folder, 'template', 'index.html'), (0, 0))
+
+            self.assertIn('super.html', load_templates(folder).keys())
+
+            with open(os.path.join(folder, 'template', 'index.html'), 'a') as f:
+                f.write('\n')
+
+            loaded = load_templates(folder)
+
+            self.assertNotIn('super.html', loaded.keys())
+            self.assertNotIn('template/index.html', loaded.keys())
+            self.assertNotIn('form.html', loaded.keys())
+            self.assertIn('template.html', loaded.keys())
+
+            Template.templates, Template.cache = folder, None
+            Template.load()
+
+            self.assertEqual(set(loaded.keys()), set(Template.cache.keys()))
+
+            Template.preload()
+
+            self.assertEqual(Frame(folder).get_body('super.html'), Template.cache['super.html'])
+
+            Template.cache = None
+
+        self.assertIsNone(load_templates(templates))
+
+    def test_dependency(self):
+        templates = os.path.join(os.path.dirname(__file__), 'templates')
+
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(templates, folder := os.path.join(folder, 'templates'))
+
+            Template.templates, Template.cache, Template.reload = folder, None, None
+            Template.dependents, Template.stamps = dict(), dict()
+            Template.preload()
+
+            self.assertEqual(
+                {'fragment.html', 'form.html', 'super.html', 'template/base.html'},
+                Template.dependents['template/base.html'],
+            )
+            self.assertEqual(
+                {'fragment.html', 'form.html', 'super.html', 'template/base.html', 'template/index.html'},
+                Template.dependents['template/index.html'],
+            )
+
+            with open(os.path.join(folder, 'template', 'base.html'), 'a') as f:
+                f.write('\n<!-- base -->')
+
+            os.utime(os.path.join(folder, 'template', 'base.html'), ns=(0, 0))
+
+            template = Template.cache['template.html']
+
+            self.assertEqual(
+                {'fragment.html', 'form.html', 'super.html', 'template/base.html'}, Template.refresh()
+            )
+            self.assertNotIn('super.html', Template.cache.keys())
+            self.assertNotIn('template/index.html', Template.refresh())
+            self.assertIs(template, Template.cache['template.html'])
+            self.assertIn('<!-- base -->', Template('super.html').body)
+            self.assertIn('super.html', Template.cache.keys())
+            self.assertEqual(set(), Template.refresh())
+
+            Template.cache, Template.reload = None, 1
+            Template.dependents, Template.stamps = dict(), dict()
+
+    def test_resolve(self):
+        Template.templates = os.path.join(os.path.dirname(__file__), 'templates')
+        Template.paths, Template.missing = dict(), set()
+
+        for filename, name in (
+                ('template.html', 'template.html'),
+                ('template/../template.html', 'template.html'),
+                ('./template/index.html', 'template/index.html'),
+                ('../templates/template.html', None),
+                ('template/../../test_response.py', None),
+                ('/etc/passwd', None),
+                ('template\\index.html', None),
+                ('missing.html', None),
+                ('', None),
+        ):
+            self.assertEqual(name, Template.resolve(filename))
+
+        self.assertIn('missing.html', Template.missing)
+        self.assertEqual('template.html', Template.paths['template/../template.html'])
+        self.assertIsNone(Template('../test_response.py').body)
+        self.assertEqual(b'Template file not found.', Template('../../etc/passwd').render(None))
+
     def test_template(self):
         app = Main(__name__, Map((
             Rule('/', 'index'),
@@ -241,6 +744,16 @@ def response_tests():
     for test in (
             'test_init',
             'test_header',
+            'test_cookie',
+            'test_etag',
+            'test_json',
+            'test_event',
+            'test_fragment',
+            'test_escape',
+            'test_control',
+            'test_compile',
+            'test_dependency',
+            'test_resolve',
             'test_template',
     ):
         suite.addTest(TestModule(test))
@@ -0,0 +1,170 @@
+import io
+import unittest
+
+from framework.cache import Cache
+from framework.executor import Pool, Processes
+from framework.http.request import Path
+from framework.http.session import (
+    Sessions,
+    get_session, has_session, set_session, delete_session, clear_session,
+)
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map
+
+from .. import dummy_environ, DummyStartResponse
+
+environ, start_response = dummy_environ.copy(), DummyStartResponse()
+
+
+def dummy_session(path: Path):
+    match path['action']:
+        case 'set':
+            set_session('user', {'id': 1})
+            set_session('count', 1)
+
+        case 'increment':
+            set_session('count', get_session('count') + 1)
+
+        case 'delete':
+            delete_session('missing')
+            delete_session('user')
+
+        case 'clear':
+            clear_session()
+
+    return f"{get_session('count')} {has_session('user')}"
+
+
+def dummy_who():
+    return f"hello {get_session('user')}"
+
+
+def dummy_public():
+    return 'public'
+
+
+def set_cookie(headers: list[tuple[str, str]]):
+    for key, value in headers:
+        if 'set-cookie' == key:
+            return value
+
+
+class TestModule(unittest.TestCase):
+    def test_sessions(self):
+        sessions = Sessions(('new', 'old'), max_age=60)
+        value = Sessions('old').dumps({'user': 1})
+
+        self.assertEqual({'user': 1}, sessions.loads(value))
+        self.assertIsNone(Sessions('other').loads(value))
+        self.assertIsNone(sessions.loads(value[:-2] + 'AA'))
+        self.assertIsNone(sessions.loads('garbage'))
+        self.assertIsNone(Sessions('old', max_age=-1).loads(value))
+        self.assertNotIn('=', value)
+
+        with self.assertRaises(ValueError) as context:
+            Sessions(())
+
+        self.assertEqual('Session. At least one secret key is required.', context.exception.args[0])
+
+    def test_session(self):
+        for pool in (None, Pool(workers=1)):
+            urlmap = Map((
+                Rule('/<action>', 'session'),
+                Endpoint('session', dummy_session, blocking=pool is not None),
+            ))
+
+            app = Main(__name__, urlmap, pool=pool, sessions=Sessions('secret'))
+
+            environ['PATH_INFO'] = '/set'
+
+            self.assertEqual(b'1 True', b''.join(app(environ, start_response)))
+
+            cookie = set_cookie(start_response.headers)
+
+            self.assertTrue(cookie.startswith('session='))
+            self.assertTrue(cookie.endswith('; Path=/; HttpOnly; SameSite=Lax'))
+
+            environ['PATH_INFO'], environ['HTTP_COOKIE'] = '/read', cookie.split('; ')[0]
+
+            self.assertEqual(b'1 True', b''.join(app(environ, start_response)))
+            self.assertIsNone(set_cookie(start_response.headers))
+
+            environ['PATH_INFO'] = '/increment'
+
+            self.assertEqual(b'2 True', b''.join(app(environ, start_response)))
+
+            environ['PATH_INFO'], environ['HTTP_COOKIE'] = '/delete', set_cookie(start_response.headers).split('; ')[0]
+
+            self.assertEqual(b'2 False', b''.join(app(environ, start_response)))
+
+            environ['PATH_INFO'], environ['HTTP_COOKIE'] = '/clear', set_cookie(start_response.headers).split('; ')[0]
+
+            self.assertEqual(b'None False', b''.join(app(environ, start_response)))
+            self.assertTrue(set_cookie(start_response.headers).startswith('session=; expires=Thu, 01 Jan 1970'))
+
+            environ['PATH_INFO'], environ['HTTP_COOKIE'] = '/read', 'session=forged.0.AAAA'
+
+            self.assertEqual(b'None False', b''.join(app(environ, start_response)))
+
+            del environ['HTTP_COOKIE']
+
+            if pool is not None:
+                pool.shutdown()
+
+        app = Main(__name__, Map((
+            Rule('/<action>', 'session'),
+            Endpoint('session', dummy_session),
+        )))
+
+        environ['wsgi.errors'] = errors = io.StringIO()
+
+        self.assertEqual(b'Internal Server Error', b''.join(app(environ, start_response)))
+        self.assertEqual('500 Internal Server Error', start_response.status)
+        self.assertIn('RuntimeError: Session. Sessions are not configured', errors.getvalue())
+
+        del environ['wsgi.errors']
+
+    def test_cache(self):
+        sessions = Sessions('secret')
+        processes = Processes(workers=1, timeout=5)
+
+        for process in (False, True):
+            app = Main(__name__, Map((
+                Rule('/who', 'who'),
+                Endpoint('who', dummy_who, cache=Cache(60), process=process),
+                Rule('/public', 'public'),
+                Endpoint('public', dummy_public, cache=Cache(60)),
+            )), processes=processes, sessions=sessions)
+
+            try:
+                for user in ('alice', 'bob'):
+                    environ['PATH_INFO'] = '/who'
+                    environ['HTTP_COOKIE'] = f"session={sessions.dumps({'user': user})}"
+
+                    self.assertEqual(f"hello {user}".encode(), b''.join(app(environ, start_response)))
+
+                environ['PATH_INFO'] = '/public'
+
+                self.assertEqual(b'public', b''.join(app(environ, start_response)))
+
+            finally:
+                del environ['HTTP_COOKIE']
+
+            self.assertIsNone(app.router.cache['who'].get(app.router.lookup(environ, 'who')[0]))
+            self.assertIsNotNone(app.router.cache['public'].get(app.router.lookup(environ, 'public')[0]))
+
+        processes.shutdown()
+
+
+
+def session_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_sessions',
+            'test_session',
+            'test_cache',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
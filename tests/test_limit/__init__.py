@@ -0,0 +1,210 @@
+import os
+import unittest
+from typing import Any
+
+from framework.limit import Misses, Quota, RateLimit
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map, Mount
+
+from .. import dummy_environ, DummyStartResponse
+
+environ, start_response = dummy_environ.copy(), DummyStartResponse()
+
+calls = {'parse': 0}
+
+
+def dummy_body():
+    return b'body'
+
+
+class DummyDispatch(object):
+    __slots__ = ('dispatch',)
+
+    def __init__(self, dispatch: Any):
+        self.dispatch = dispatch
+
+    def parse(self, environ: dict[str, Any]):
+        calls['parse'] += 1
+
+        return self.dispatch.parse(environ)
+
+
+class TestModule(unittest.TestCase):
+    def test_misses(self):
+        misses = Misses(60, entries=2)
+
+        for path in ('/one', '/two', '/three'):
+            misses.add({'PATH_INFO': path})
+
+        self.assertNotIn({'PATH_INFO': '/one'}, misses)
+        self.assertIn({'PATH_INFO': '/three'}, misses)
+        self.assertNotIn({'PATH_INFO': '/three', 'HTTP_HOST': 'example.com'}, misses)
+
+        misses.ttl = -1
+        misses.add({'PATH_INFO': '/four'})
+
+        self.assertNotIn({'PATH_INFO': '/four'}, misses)
+
+        with self.assertRaises(ValueError) as context:
+            Misses(0)
+
+        self.assertEqual('Negative cache. TTL must be a positive number: 0.', context.exception.args[0])
+
+    def test_rate_limit(self):
+        limit = RateLimit(1, 2, header='X-Forwarded-For', entries=2)
+
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.1'}))
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.1'}))
+        self.assertEqual(1, limit.take({'REMOTE_ADDR': '10.0.0.1'}))
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.9', 'HTTP_X_FORWARDED_FOR': '1.2.3.4, 10.0.0.3'}))
+        self.assertIn('10.0.0.3', limit.store.keys())
+        self.assertNotIn('1.2.3.4', limit.store.keys())
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.2'}))
+        self.assertNotIn('10.0.0.1', limit.store.keys())
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.1'}))
+
+        limit = RateLimit(1, 1, header='X-Forwarded-For', proxies=2)
+
+        for forwarded in ('1.1.1.1, 10.0.0.1, 10.0.0.2', '2.2.2.2, 10.0.0.1, 10.0.0.2'):
+            self.assertEqual(0 if '1.1.1.1' in forwarded else 1, limit.take({
+                'REMOTE_ADDR': '10.0.0.3', 'HTTP_X_FORWARDED_FOR': forwarded,
+            }))
+
+        self.assertEqual(['10.0.0.1'], list(limit.store.keys()))
+        self.assertEqual(0, limit.take({'REMOTE_ADDR': '10.0.0.3', 'HTTP_X_FORWARDED_FOR': '10.0.0.2'}))
+        self.assertIn('10.0.0.3', limit.store.keys())
+
+        for message, args, kwargs in (
+                ('Rate limit. Rate must be a positive number: 0.', (0,), {}),
+                ('Client. Trusted proxies must be a positive number: 0.', (1,), {'proxies': 0}),
+        ):
+            with self.assertRaises(ValueError) as context:
+                RateLimit(*args, **kwargs)
+
+            self.assertEqual(message, context.exception.args[0])
+
+    def test_main(self):
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+        )), misses=Misses(), rate_limit=RateLimit(1, 3))
+
+        app.router.dispatch = DummyDispatch(app.router.dispatch)
+
+        environ['PATH_INFO'], environ['REMOTE_ADDR'] = '/missing', '10.0.0.1'
+
+        for _ in range(2):
+            self.assertEqual(b'Not Found', b''.join(app(environ, start_response)))
+            self.assertEqual('404 Not Found', start_response.status)
+
+        self.assertEqual(1, calls['parse'])
+
+        environ['PATH_INFO'] = '/body'
+
+        self.assertEqual(b'body', b''.join(app(environ, start_response)))
+        self.assertEqual(b'Too Many Requests', b''.join(app(environ, start_response)))
+        self.assertEqual('429 Too Many Requests', start_response.status)
+        self.assertEqual('1', dict(start_response.headers)['retry-after'])
+        self.assertEqual(2, calls['parse'])
+
+        environ['REMOTE_ADDR'] = '10.0.0.2'
+
+        self.assertEqual(b'body', b''.join(app(environ, start_response)))
+
+        del environ['REMOTE_ADDR']
+
+    def test_quota(self):
+        quota = Quota(2, 60, key='X-Api-Key')
+
+        self.assertEqual(0, quota.take({'REMOTE_ADDR': '10.0.0.1'}))
+
+        if 0 == (pid := os.fork()):
+            os._exit(quota.take({'REMOTE_ADDR': '10.0.0.1'}))
+
+        self.assertEqual(0, os.waitpid(pid, 0)[1])
+        self.assertLess(0, retry_after := quota.take({'REMOTE_ADDR': '10.0.0.1'}))
+        self.assertGreaterEqual(60, retry_after)
+        self.assertLess(0, quota.take({'REMOTE_ADDR': '10.0.0.1', 'HTTP_X_API_KEY': 'key'}))
+        self.assertEqual(0, quota.take({'REMOTE_ADDR': '10.0.0.2'}))
+
+        for address, expected in (('10.0.0.3', 0), ('10.0.0.4', 0), ('10.0.0.5', 1)):
+            self.assertEqual(expected, min(1, quota.take({'REMOTE_ADDR': address, 'HTTP_X_API_KEY': 'key'})))
+
+        quota = Quota(1, 60, key='X-Api-Key')
+
+        self.assertEqual([0, 1, 1, 1, 1], [
+            min(1, quota.take({'REMOTE_ADDR': '10.0.0.1', 'HTTP_X_API_KEY': f"key{i}"})) for i in range(5)
+        ])
+
+        quota = Quota(2, 60, slots=4)
+
+        for i in range(4):
+            self.assertEqual(0, quota.take({'REMOTE_ADDR': f"10.0.1.{i}"}))
+
+        self.assertLess(0, quota.take({'REMOTE_ADDR': '10.0.1.9'}))
+
+        for i in range(4):
+            self.assertEqual(0, quota.take({'REMOTE_ADDR': f"10.0.1.{i}"}))
+            self.assertLess(0, quota.take({'REMOTE_ADDR': f"10.0.1.{i}"}))
+
+        quota = Quota(2, 60, header='X-Forwarded-For', slots=8)
+
+        for i, expected in enumerate((0, 0, 1)):
+            retry_after = quota.take({'REMOTE_ADDR': '10.0.0.9', 'HTTP_X_FORWARDED_FOR': f"1.1.1.{i}, 10.0.0.5"})
+
+            self.assertEqual(expected, min(1, retry_after))
+
+        self.assertEqual(0, quota.take({'REMOTE_ADDR': '10.0.0.9', 'HTTP_X_FORWARDED_FOR': '10.0.0.6'}))
+
+        for message, args in (
+                ('Quota. Requests must be a positive number: 0.', (0,)),
+                ('Quota. Period must be a positive number: 0.', (1, 0)),
+        ):
+            with self.assertRaises(ValueError) as context:
+                Quota(*args)
+
+            self.assertEqual(message, context.exception.args[0])
+
+    def test_endpoint(self):
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body, limit=Quota(1, 60)),
+            Rule('/free', 'free'),
+            Endpoint('free', dummy_body),
+            Mount('/api', Map((
+                Rule('/body', 'body'),
+                Endpoint('body', dummy_body, limit=Quota(1, 60)),
+            ))),
+        )))
+
+        self.assertEqual({'body', 'api.body'}, set(app.router.limits.keys()))
+
+        environ['REMOTE_ADDR'] = '10.0.0.1'
+
+        for path in ('/body', '/api/body'):
+            environ['PATH_INFO'] = path
+
+            self.assertEqual(b'body', b''.join(app(environ, start_response)))
+            self.assertEqual(b'Too Many Requests', b''.join(app(environ, start_response)))
+            self.assertEqual('429 Too Many Requests', start_response.status)
+
+        environ['PATH_INFO'] = '/free'
+
+        self.assertEqual(b'body', b''.join(app(environ, start_response)))
+
+        del environ['REMOTE_ADDR']
+
+
+def limit_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_misses',
+            'test_rate_limit',
+            'test_main',
+            'test_quota',
+            'test_endpoint',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -1,11 +1,19 @@
+import io
 import json
 import os
 import shutil
 import unittest
-
-from framework.http.request import Path
+from collections.abc import Callable
+from typing import Any
+from wsgiref.util import setup_testing_defaults
+from wsgiref.validate import validator
+
+from framework.cache import Cache
+from framework.executor import Processes
+from framework.http.request import Path, cookie
+from framework.http.response import set_cookie, set_header
 from framework.main import Main
-from framework.routing import Rule, Endpoint, Map
+from framework.routing import Rule, Endpoint, Map, Middleware
 
 from .. import dummy_environ, DummyStartResponse
 
@@ -16,6 +24,61 @@ def dummy_status(path: Path):
     return b'', path['status']
 
 
+def dummy_body():
+    return b'body'
+
+
+def dummy_raise():
+    raise KeyError('missing')
+
+
+def dummy_leak():
+    set_header('x-user', 'alice')
+    set_cookie('sid', 'secret')
+
+    raise KeyError('leak')
+
+
+def dummy_name(path: Path):
+    return f"name {path['name']}"
+
+
+def dummy_outer(call_next: Callable[..., Any], *args, **kwargs):
+    set_header('outer', 'outer')
+
+    return call_next(*args, **kwargs)
+
+
+def dummy_inner(call_next: Callable[..., Any], *args, **kwargs):
+    return f"inner {call_next(*args, **kwargs)}"
+
+
+def dummy_auth(call_next: Callable[..., Any], *args, **kwargs):
+    if 'secret' != kwargs['path']['name']:
+        return 'Unauthorized', 401
+
+    return call_next(*args, **kwargs)
+
+
+def dummy_gate(call_next: Callable[..., Any], *args, **kwargs):
+    if 'open' != cookie('gate'):
+        return 'Forbidden', 403
+
+    return call_next(*args, **kwargs)
+
+
+class DummyError(object):
+    calls: list[int] = list()
+
+    def __call__(self, code: int):
+        self.calls.append(code)
+
+        if 503 == code:
+            raise RuntimeError('handler')
+
+        return f"error {code}", code, None, 'text/plain'
+
+
 class TestModule(unittest.TestCase):
     def test_default(self):
         static_folder = os.path.join(os.path.dirname(__file__), 'static')
@@ -134,14 +197,228 @@ class TestModule(unittest.TestCase):
         )))
 
         self.assertEqual('200 OK', status(200))
+        self.assertEqual('201 Created', status(201))
         self.assertEqual('301 Moved Permanently', status(301))
         self.assertEqual('302 Moved Temporarily', status(302))
         self.assertEqual('307 Temporary Redirect', status(307))
         self.assertEqual('308 Permanent Redirect', status(308))
         self.assertEqual('403 Forbidden', status(403))
         self.assertEqual('404 Not Found', status(404))
+        self.assertEqual('429 Too Many Requests', status(429))
         self.assertEqual('500 Internal Server Error', status(500))
         self.assertEqual('520 Unknown Error', status(520))
+        self.assertEqual('520 Unknown Error', status(599))
+
+    def test_method(self):
+        app = Main(__name__, Map((
+            Rule('/<int:status>', 'status', methods=('GET',)),
+            Endpoint('status', dummy_status),
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+        )))
+
+        environ['PATH_INFO'], environ['REQUEST_METHOD'] = '/200', 'POST'
+
+        self.assertEqual(b'Method Not Allowed', b''.join(app(environ, start_response)))
+        self.assertEqual('405 Method Not Allowed', start_response.status)
+        self.assertEqual('GET, HEAD', dict(start_response.headers)['allow'])
+
+        environ['PATH_INFO'], environ['REQUEST_METHOD'] = '/body', 'HEAD'
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('200 OK', start_response.status)
+        self.assertEqual('4', dict(start_response.headers)['content-length'])
+
+        environ['REQUEST_METHOD'] = 'GET'
+
+        self.assertEqual(b'body', b''.join(app(environ, start_response)))
+
+    def test_host(self):
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+            Rule('/body', 'status', host='<int:status>.example.com'),
+            Endpoint('status', dummy_status),
+        )))
+
+        environ['PATH_INFO'], environ['HTTP_HOST'] = '/body', '403.example.com'
+
+        self.assertEqual(b'', b''.join(app(environ, start_response)))
+        self.assertEqual('403 Forbidden', start_response.status)
+
+        environ['HTTP_HOST'] = 'example.com'
+
+        self.assertEqual(b'body', b''.join(app(environ, start_response)))
+
+        del environ['HTTP_HOST']
+
+    def test_chunk(self):
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+        )))
+
+        environ['PATH_INFO'] = '/body'
+
+        self.assertEqual([b'body'], app(environ, start_response))
+
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+        )), chunk_size=3)
+
+        self.assertEqual([b'bod', b'y'], list(app(environ, start_response)))
+
+        setup_testing_defaults(validated := {'PATH_INFO': '/body', 'SCRIPT_NAME': '', 'QUERY_STRING': ''})
+
+        validated = validator(app)(validated, start_response)
+
+        self.assertEqual([b'bod', b'y'], list(validated))
+
+        validated.close()
+
+        Main(__name__, Map(()))
+
+    def test_error(self):
+        urlmap = Map((
+            Rule('/body', 'body', methods=('GET',)),
+            Endpoint('body', dummy_body),
+            Rule('/raise', 'raise'),
+            Endpoint('raise', dummy_raise),
+            Rule('/leak', 'leak'),
+            Endpoint('leak', dummy_leak),
+        ))
+
+        environ['wsgi.errors'] = errors = io.StringIO()
+
+        app = Main(__name__, urlmap)
+
+        environ['PATH_INFO'] = '/raise'
+
+        self.assertEqual(b'Internal Server Error', b''.join(app(environ, start_response)))
+        self.assertEqual('500 Internal Server Error', start_response.status)
+        self.assertIn("KeyError: 'missing'", errors.getvalue())
+
+        for path in ('/leak', '/raise'):
+            environ['PATH_INFO'] = path
+
+            self.assertEqual(b'Internal Server Error', b''.join(app(environ, start_response)))
+            self.assertNotIn('x-user', dict(start_response.headers))
+            self.assertNotIn('set-cookie', dict(start_response.headers))
+
+        environ['PATH_INFO'] = '/missing'
+
+        self.assertEqual(b'Not Found', b''.join(app(environ, start_response)))
+        self.assertIn(404, app.router.errors.keys())
+        self.assertEqual([b'Not Found'], app(environ, start_response))
+        self.assertEqual('404 Not Found', start_response.status)
+
+        DummyError.calls.clear()
+
+        for static_errors, calls in ((False, [404, 404, 405, 405, 500, 500]), (True, [404, 405, 500])):
+            app = Main(__name__, urlmap, (DummyError,), static_errors=static_errors)
+
+            for path in ('/missing', '/missing'):
+                environ['PATH_INFO'] = path
+
+                self.assertEqual(b'error 404', b''.join(app(environ, start_response)))
+                self.assertEqual('404 Not Found', start_response.status)
+
+            environ['PATH_INFO'], environ['REQUEST_METHOD'] = '/body', 'POST'
+
+            for _ in range(2):
+                self.assertEqual(b'error 405', b''.join(app(environ, start_response)))
+                self.assertEqual(['GET, HEAD'], [v for k, v in start_response.headers if 'allow' == k])
+
+            environ['PATH_INFO'], environ['REQUEST_METHOD'] = '/leak', 'GET'
+
+            self.assertEqual(b'error 500', b''.join(app(environ, start_response)))
+
+            environ['PATH_INFO'] = '/raise'
+
+            self.assertEqual(b'error 500', b''.join(app(environ, start_response)))
+            self.assertNotIn('x-user', dict(start_response.headers))
+            self.assertEqual(calls, DummyError.calls)
+
+            DummyError.calls.clear()
+
+        self.assertEqual(b'Service Unavailable', b''.join(app.router.unavailable(1)(start_response)))
+        self.assertEqual('1', dict(start_response.headers)['retry-after'])
+        self.assertIn('RuntimeError: handler', errors.getvalue())
+
+        del environ['wsgi.errors']
+
+    def test_middleware(self):
+        app = Main(__name__, Map((
+            Rule('/body', 'body'),
+            Endpoint('body', dummy_body),
+            Rule('/name/<name>', 'name'),
+            Endpoint('name', dummy_name),
+            Rule('/admin/<name>', 'admin'),
+            Endpoint('admin', dummy_name, blocking=True),
+        )), middleware=(
+            Middleware(dummy_outer, exclude='body'),
+            Middleware(dummy_inner, 'name'),
+            Middleware(dummy_auth, ('admin',)),
+        ))
+
+        self.assertEqual({'name', 'admin'}, set(app.router.chains.keys()))
+
+        for path, status, body in (
+                ('/body', '200 OK', b'body'),
+                ('/name/one', '200 OK', b'inner name one'),
+                ('/admin/secret', '200 OK', b'name secret'),
+                ('/admin/guest', '401 Unauthorized', b'Unauthorized'),
+        ):
+            environ['PATH_INFO'] = path
+
+            self.assertEqual(body, b''.join(app(environ, start_response)))
+            self.assertEqual(status, start_response.status)
+            self.assertEqual('body' != path[1:], 'outer' in dict(start_response.headers))
+
+        app.router.pool.shutdown()
+
+        app = Main(__name__, Map((
+            Rule('/cached/<name>', 'cached'),
+            Endpoint('cached', dummy_name, cache=Cache(60)),
+            Rule('/process/<name>', 'process'),
+            Endpoint('process', dummy_name, process=True),
+        )), processes=(processes := Processes(workers=1, timeout=5)), middleware=(
+            Middleware(dummy_outer),
+            Middleware(dummy_gate, 'cached'),
+            Middleware(dummy_auth, 'process'),
+        ))
+
+        self.assertEqual({'cached', 'process'}, set(app.router.chains.keys()))
+
+        try:
+            for path, gate, status, body in (
+                    ('/cached/one', 'open', '200 OK', b'name one'),
+                    ('/cached/one', 'closed', '403 Forbidden', b'Forbidden'),
+                    ('/cached/one', 'open', '200 OK', b'name one'),
+                    ('/process/guest', 'open', '401 Unauthorized', b'Unauthorized'),
+                    ('/process/secret', 'open', '200 OK', b'name secret'),
+            ):
+                environ['PATH_INFO'], environ['HTTP_COOKIE'] = path, f"gate={gate}"
+
+                self.assertEqual(body, b''.join(app(environ, start_response)))
+                self.assertEqual(status, start_response.status)
+                self.assertIn('outer', dict(start_response.headers))
+
+            self.assertEqual(1, len(app.router.cache['cached'].backend.store))
+            self.assertEqual(1, processes.stats()['submitted'])
+
+        finally:
+            del environ['HTTP_COOKIE']
+
+            processes.shutdown()
+
+        with self.assertRaises(ValueError) as context:
+            Middleware('dummy_outer')
+
+        self.assertEqual(
+            "URL Map. Middleware. Middleware must be callable: 'dummy_outer'.", context.exception.args[0]
+        )
 
 
 def main_tests():
@@ -151,6 +428,11 @@ def main_tests():
             'test_default',
             'test_args',
             'test_status',
+            'test_method',
+            'test_host',
+            'test_chunk',
+            'test_error',
+            'test_middleware',
     ):
         suite.addTest(TestModule(test))
 
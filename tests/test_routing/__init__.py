@@ -3,6 +3,7 @@ from typing import Any
 
 from framework.routing import Rule, Endpoint, Map
 
+from .test_kernel import kernel_tests
 from .test_map import map_tests
 from .. import dummy, Dummy
 
@@ -163,6 +164,7 @@ def routing_tests():
     ):
         suite.addTest(TestModule(test))
 
+    suite.addTests(kernel_tests())
     suite.addTests(map_tests())
 
     return suite
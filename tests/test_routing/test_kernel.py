@@ -0,0 +1,35 @@
+import unittest
+
+from framework.routing.kernel import status, content_type, content_types, length_header, type_header
+
+
+class TestModule(unittest.TestCase):
+    def test_status(self):
+        self.assertEqual('100 Continue', status(100))
+        self.assertEqual('302 Moved Temporarily', status(302))
+        self.assertEqual('418 I\'m a Teapot', status(418))
+        self.assertEqual('520 Unknown Error', status(520))
+        self.assertEqual('520 Unknown Error', status(999))
+
+    def test_content_type(self):
+        self.assertEqual('text/plain', content_type(None, None))
+        self.assertEqual('text/plain; charset=utf-8', content_type(None, 'utf-8'))
+        self.assertEqual('text/html; charset=latin-1', content_type('text/html', 'latin-1'))
+        self.assertEqual('application/json', content_type('application/json', 'utf-8'))
+        self.assertIs(content_type('text/html', 'latin-1'), content_types['text/html', 'latin-1'])
+        self.assertEqual(('content-type', 'text/plain'), type_header('text/plain'))
+        self.assertIs(type_header('text/plain'), type_header('text/plain'))
+        self.assertEqual(('content-length', '52'), length_header(52))
+        self.assertIs(length_header(52), length_header(52))
+
+
+def kernel_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_status',
+            'test_content_type',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
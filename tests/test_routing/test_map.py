@@ -1,7 +1,7 @@
 import unittest
 
-from framework.routing import Rule, Endpoint, Map
-from framework.routing.map import Link, Pattern, Callback
+from framework.routing import Rule, Endpoint, Mount, Map
+from framework.routing.map import Link, Pattern, Host, Dispatch, Callback
 
 from .. import dummy, Dummy
 
@@ -86,6 +86,155 @@ class TestModule(unittest.TestCase):
 
         self.assertTupleEqual(Callback(urlmap)['token'], ('tests', 'Dummy', '__call__', ('args',)))
 
+    def test_method(self):
+        urlmap = Map((
+            Rule('/', 'index', methods=('get',)),
+            Rule('/', 'create', methods=('POST',)),
+            Rule('/<name>', 'slug'),
+            Rule('/<name>/head', 'head', methods=('GET',)),
+            Rule('/<name>/head', 'header', methods=('HEAD',)),
+        ))
+
+        self.assertTupleEqual(urlmap.pattern['^/$'], ({'GET': 'index', 'POST': 'create'}, ()))
+        self.assertTupleEqual(urlmap.pattern['^/([A-Za-z0-9_-]+)$'], ('slug', ((0, 'name'),)))
+
+        pattern = Pattern(urlmap)
+
+        for method, path, link in (
+                ('GET', '/', 'index'),
+                ('HEAD', '/', 'index'),
+                ('POST', '/', 'create'),
+                ('DELETE', '/name', 'slug'),
+                ('GET', '/name/head', 'head'),
+                ('HEAD', '/name/head', 'header'),
+        ):
+            self.assertEqual(link, pattern.parse({'REQUEST_METHOD': method, 'PATH_INFO': path})[0])
+
+        self.assertTupleEqual(
+            (None, {'allow': 'GET, HEAD, POST'}),
+            pattern.parse({'REQUEST_METHOD': 'PUT', 'PATH_INFO': '/'}),
+        )
+
+        with self.assertRaises(ValueError) as context:
+            Map((Rule('/', 'index', methods=('GET', 'POST')), Rule('/', 'create', methods=('POST',))))
+
+        self.assertEqual(
+            "URL Map. Rule. Path already exists for methods POST: '/'.",
+            context.exception.args[0],
+        )
+
+        with self.assertRaises(ValueError) as context:
+            Map((Rule('/', 'index'), Rule('/', 'create', methods=('POST',))))
+
+        self.assertEqual(
+            "URL Map. Rule. Path already exists in pattern list: '/'.",
+            context.exception.args[0],
+        )
+
+    def test_host(self):
+        urlmap = Map((
+            Rule('/', 'index'),
+            Rule('/', 'api', host='API.example.com'),
+            Rule('/<int:pk>', 'item', host='<sub>.example.com'),
+            Rule('/', 'sub', host='<sub>.example.com'),
+        ))
+
+        self.assertDictEqual({'^/$': ('index', ())}, urlmap.pattern)
+        self.assertDictEqual({'^/$': ('api', ())}, urlmap.host['api.example.com'])
+        self.assertDictEqual({
+            '^/(\\d+)$': ('item', ((0, 'sub'), (1, 'pk'))),
+            '^/$': ('sub', ((0, 'sub'),)),
+        }, urlmap.host['^([A-Za-z0-9-]+)\\.example\\.com$'])
+
+        host = Host(urlmap)
+
+        self.assertListEqual(['api.example.com'], list(host.keys()))
+        self.assertEqual(1, len(host.dynamic))
+
+        self.assertEqual('api', host.parse({'HTTP_HOST': 'api.example.com:8000', 'PATH_INFO': '/'})[0])
+
+        link, kwargs = host.parse({'HTTP_HOST': 'blog.example.com', 'PATH_INFO': '/42'})
+
+        self.assertEqual('item', link)
+        self.assertEqual("{'sub': 'blog', 'pk': 42}", str(kwargs['path']))
+
+        link, kwargs = host.parse({'HTTP_HOST': 'blog.example.com', 'PATH_INFO': '/'})
+
+        self.assertEqual(('sub', 'blog'), (link, kwargs['path']['sub']))
+        self.assertTupleEqual((None, {}), host.parse({'SERVER_NAME': 'example.org', 'PATH_INFO': '/'}))
+
+        with self.assertRaises(ValueError) as context:
+            Map((Rule('/<sub>', 'link', host='<sub>.example.com'),))
+
+        self.assertEqual(
+            'URL Map. Rule. Host and path tokens must not share names: sub.',
+            context.exception.args[0],
+        )
+
+    def test_mount(self):
+        users = Map((
+            Rule('/<int:pk>', 'item', methods=('GET',)),
+            Endpoint('item', dummy),
+        ))
+
+        admin = Map((
+            Rule('/', 'index'),
+            Endpoint('index', dummy),
+            Mount('/users', users),
+        ))
+
+        urlmap = Map((
+            Rule('/', 'index'),
+            Endpoint('index', dummy),
+            Mount('/admin', admin, 'panel'),
+        ))
+
+        self.assertDictEqual({'^/$': ('index', ())}, urlmap.pattern)
+        self.assertTupleEqual(('tests', 'dummy', None, ()), urlmap.callback['panel.users.item'])
+
+        link = Link(urlmap)
+
+        self.assertEqual('/admin/', link.collect(('panel.index',), {}))
+        self.assertEqual('/admin/users/7', link.collect(('panel.users.item',), {'pk': '7'}))
+        self.assertEqual('/', link.collect(('index',), {}))
+
+        dispatch = Dispatch(urlmap)
+
+        self.assertListEqual(['/admin'], list(dispatch.mount.keys()))
+
+        for path, model in (
+                ('/', 'index'),
+                ('/admin', 'panel.index'),
+                ('/admin/', 'panel.index'),
+                ('/admin/users/7', 'panel.users.item'),
+                ('/other', None),
+                ('/admin/other', None),
+        ):
+            self.assertEqual(model, dispatch.parse({'PATH_INFO': path})[0])
+
+        self.assertEqual(
+            "{'pk': 7}", str(dispatch.parse({'PATH_INFO': '/admin/users/7'})[1]['path'])
+        )
+        self.assertDictEqual(
+            {'allow': 'GET, HEAD'}, dispatch.parse({'PATH_INFO': '/admin/users/7', 'REQUEST_METHOD': 'POST'})[1]
+        )
+
+        with self.assertRaises(ValueError) as context:
+            Map((Mount('/admin/users', users),))
+
+        self.assertEqual(
+            "URL Map. Mount. Prefix must be a single path segment: '/admin/users'.",
+            context.exception.args[0],
+        )
+
+        with self.assertRaises(ValueError) as context:
+            Map((Mount('/one', users, 'users'), Mount('/two', users, 'users')))
+
+        self.assertEqual(
+            "URL Map. Mount. Link already exists in link list: 'users.item'.",
+            context.exception.args[0],
+        )
+
 
 def map_tests():
     suite = unittest.TestSuite()
@@ -94,6 +243,9 @@ def map_tests():
             'test_blank',
             'test_path',
             'test_token',
+            'test_method',
+            'test_host',
+            'test_mount',
     ):
         suite.addTest(TestModule(test))
 
@@ -0,0 +1,155 @@
+import contextlib
+import io
+import os
+import socket
+import unittest
+
+from framework.http.response import set_header
+from framework.http.response.template import Template
+from framework.main import Main
+from framework.routing import Rule, Endpoint, Map
+from framework.server import BadRequest, read_request, keep_alive, Worker
+
+
+def dummy_echo():
+    set_header('echo', 'yes')
+
+    return 'echo'
+
+
+def parse(data: bytes):
+    return read_request(io.BufferedReader(io.BytesIO(data)), ('localhost', 8000), ('127.0.0.1', 5000))
+
+
+class TestModule(unittest.TestCase):
+    def test_request(self):
+        environ = parse(
+            b'POST /path%20name?a=1 HTTP/1.1\r\n'
+            b'Host: example.com\r\n'
+            b'Content-Type: text/plain\r\n'
+            b'Content-Length: 4\r\n'
+            b'Cookie: a=1\r\n'
+            b'Cookie: b=2\r\n'
+            b'\r\n'
+            b'bodyGET / HTTP/1.1\r\n'
+        )
+
+        self.assertEqual('POST', environ['REQUEST_METHOD'])
+        self.assertEqual('/path name', environ['PATH_INFO'])
+        self.assertEqual('a=1', environ['QUERY_STRING'])
+        self.assertEqual('example.com', environ['HTTP_HOST'])
+        self.assertEqual('text/plain', environ['CONTENT_TYPE'])
+        self.assertEqual('a=1; b=2', environ['HTTP_COOKIE'])
+        self.assertEqual('127.0.0.1', environ['REMOTE_ADDR'])
+        self.assertEqual(b'body', environ['wsgi.input'].read())
+
+        environ = parse(
+            b'PUT / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n4\r\nbody\r\n5;x=y\r\nchunk\r\n0\r\n\r\n'
+        )
+
+        self.assertEqual(b'bodychunk', environ['wsgi.input'].read())
+        self.assertIsNone(parse(b''))
+
+        with self.assertRaises(BadRequest):
+            parse(b'garbage\r\n\r\n')
+
+        with self.assertRaises(BadRequest):
+            parse(b'GET / HTTP/1.1\r\nbroken\r\n\r\n')
+
+    def test_keep_alive(self):
+        self.assertTrue(keep_alive({'SERVER_PROTOCOL': 'HTTP/1.1'}))
+        self.assertFalse(keep_alive({'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_CONNECTION': 'close'}))
+        self.assertFalse(keep_alive({'SERVER_PROTOCOL': 'HTTP/1.0'}))
+        self.assertTrue(keep_alive({'SERVER_PROTOCOL': 'HTTP/1.0', 'HTTP_CONNECTION': 'Keep-Alive'}))
+
+    def test_worker(self):
+        app = Main(__name__, Map((
+            Rule('/', 'echo'),
+            Endpoint('echo', dummy_echo),
+        )))
+
+        listener = socket.create_server(('127.0.0.1', 0))
+        client = socket.create_connection(listener.getsockname())
+        server, peer = listener.accept()
+        worker = Worker(app, listener, 3, 1)
+
+        client.sendall(
+            b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+            b'HEAD / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+            b'GET /missing HTTP/1.1\r\nHost: localhost\r\n\r\n'
+            b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+        )
+        client.shutdown(socket.SHUT_WR)
+
+        worker.connection(server, peer)
+        server.close()
+        listener.close()
+
+        data = b''
+
+        while chunk := client.recv(65536):
+            data += chunk
+
+        client.close()
+
+        responses = data.split(b'HTTP/1.1 ')[1:]
+
+        self.assertEqual(3, len(responses))
+        self.assertEqual(3, worker.served)
+        self.assertTrue(responses[0].startswith(b'200 OK'))
+        self.assertIn(b'echo: yes\r\n', responses[0])
+        self.assertIn(b'connection: keep-alive\r\n', responses[0])
+        self.assertTrue(responses[0].endswith(b'\r\n\r\necho'))
+        self.assertTrue(responses[1].endswith(b'\r\n\r\n'))
+        self.assertTrue(responses[2].startswith(b'404 Not Found'))
+
+        listener = socket.create_server(('127.0.0.1', 0))
+        client = socket.create_connection(listener.getsockname())
+        server, peer = listener.accept()
+        worker = Worker(app, listener, 0, 1)
+
+        client.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nCookie: foo\r\n\r\n')
+        client.shutdown(socket.SHUT_WR)
+
+        with contextlib.redirect_stderr(errors := io.StringIO()):
+            worker.connection(server, peer)
+
+        server.close()
+        listener.close()
+
+        data = b''
+
+        while chunk := client.recv(65536):
+            data += chunk
+
+        client.close()
+
+        self.assertTrue(data.startswith(b'HTTP/1.1 500 Internal Server Error\r\n'))
+        self.assertTrue(data.endswith(b'\r\n\r\nInternal Server Error'))
+        self.assertIn('Traceback', errors.getvalue())
+
+    def test_preload(self):
+        templates = os.path.join(os.path.dirname(__file__), '..', 'test_http', 'templates')
+
+        app = Main(__name__, Map(()), template_folder=templates)
+        app.preload()
+
+        self.assertIsNotNone(Template.cache)
+        self.assertIn('template/index.html', Template.cache.keys())
+        self.assertEqual(Template('template.html').body, Template.cache['template.html'])
+
+        Template.cache = None
+
+
+def server_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_request',
+            'test_keep_alive',
+            'test_worker',
+            'test_preload',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -1,15 +1,25 @@
 import unittest
 
+from tests.test_asgi import asgi_tests
+from tests.test_cache import cache_tests
+from tests.test_executor import executor_tests
 from tests.test_http import http_tests
+from tests.test_limit import limit_tests
 from tests.test_main import main_tests
 from tests.test_routing import routing_tests
+from tests.test_server import server_tests
 
 
 def all_test():
     suite = unittest.TestSuite()
+    suite.addTests(asgi_tests())
+    suite.addTests(cache_tests())
+    suite.addTests(executor_tests())
     suite.addTests(http_tests())
+    suite.addTests(limit_tests())
     suite.addTests(main_tests())
     suite.addTests(routing_tests())
+    suite.addTests(server_tests())
 
     return suite
 